@@ -1,28 +1,94 @@
 import sys
+import time
+import threading
+import asyncio
 import serial
 import serial.tools.list_ports
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QVBoxLayout, QWidget, QPushButton, QComboBox, QLabel, QHBoxLayout, QFileDialog
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QVBoxLayout, QWidget, QPushButton, QComboBox, QLabel, QHBoxLayout, QFileDialog, QListWidget, QAbstractItemView
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from serial_capture import CaptureWriter, CaptureReader, format_binary, format_hex, format_char
+from serial_framing import FRAMERS, create_framer
+from serial_multi import MultiPortCapture
+from serial_async import open_serial
+from worker_control import WorkerControl
+
+MAX_REPLAY_RECORDS = 1000  # Records shown in the displays when opening a capture
+MAX_RECORDING_LINES = 1000  # Lines kept in each display while recording to a capture file
 
 class SerialThread(QThread):
     data_received = pyqtSignal(bytes)  # Signal to emit raw binary data
+    frames_received = pyqtSignal(list)  # Whole frames when a framer is set
+    frame_stats = pyqtSignal(float, int)  # Frames per second, checksum errors
 
-    def __init__(self, serial_port):
+    def __init__(self, serial_port, framer=None):
         super().__init__()
         self.serial_port = serial_port
-        self.is_running = True
+        self.control = WorkerControl()
+        self.capture_writer = None
+        self.capture_lock = threading.Lock()
+        self.framer = framer
+        self.loop = None
+        self.stream = None
 
     def run(self):
-        while self.is_running:
-            if self.serial_port.in_waiting > 0:
-                data = self.serial_port.read(self.serial_port.in_waiting)
-                self.data_received.emit(data)
+        asyncio.run(self.read_loop())
+
+    async def read_loop(self):
+        self.loop = asyncio.get_running_loop()
+        self.stream = await open_serial(self.serial_port)
+        stats_time = time.monotonic()
+        stats_frames = 0
+        while not self.control.stop_requested:
+            # Sleeps in the event loop until data arrives instead of polling in_waiting
+            try:
+                data = await asyncio.wait_for(self.stream.read(), timeout=1.0)
+            except asyncio.TimeoutError:
+                data = None
+            except serial.SerialException:
+                break
+            if data == b'':
+                break
+
+            if data:
+                with self.capture_lock:
+                    if self.capture_writer is not None:
+                        self.capture_writer.write(data)
+                if self.framer is None:
+                    self.data_received.emit(data)
+                else:
+                    frames = self.framer.feed(data)
+                    if frames:
+                        self.frames_received.emit(frames)
+
+            if self.framer is not None:
+                now = time.monotonic()
+                if now - stats_time >= 1.0:
+                    fps = (self.framer.frame_count - stats_frames) / (now - stats_time)
+                    self.frame_stats.emit(fps, self.framer.checksum_errors)
+                    stats_frames = self.framer.frame_count
+                    stats_time = now
+        self.stream.close()
+
+    def set_capture_writer(self, capture_writer):
+        # Once this returns, no chunk can still be on its way to the previous writer
+        with self.capture_lock:
+            self.capture_writer = capture_writer
 
     def stop(self):
-        self.is_running = False
+        self.control.stop()
+        if self.loop is not None and self.stream is not None and not self.loop.is_closed():
+            # Closing the stream wakes the pending read with EOF
+            try:
+                self.loop.call_soon_threadsafe(self.stream.close)
+            except RuntimeError:
+                pass  # Loop already finished
         self.quit()
         self.wait()
 
+# Carries data from the multi-port reader threads into the UI thread
+class MultiPortEmitter(QObject):
+    data_received = pyqtSignal(str, float, bytes)  # Port name, receive time, data
+
 class SerialMonitor(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -40,17 +106,51 @@ class SerialMonitor(QMainWindow):
         port_layout = QHBoxLayout()
         self.port_label = QLabel("Select COM Port:", self)
         self.port_combo = QComboBox(self)
-        self.refresh_ports()
 
         self.baud_label = QLabel("Baudrate:", self)
         self.baud_combo = QComboBox(self)
         self.baud_combo.addItems(["9600", "115200", "57600", "38400", "19200", "4800", "2400", "1200","921600"])
         self.baud_combo.setCurrentText("9600")  # Set default baudrate
 
+        self.framing_label = QLabel("Framing:", self)
+        self.framing_combo = QComboBox(self)
+        self.framing_combo.addItems(["Raw"] + list(FRAMERS))
+
+        self.crc_label = QLabel("Checksum:", self)
+        self.crc_combo = QComboBox(self)
+        self.crc_combo.addItems(["None", "crc16", "crc32"])
+
         port_layout.addWidget(self.port_label)
         port_layout.addWidget(self.port_combo)
         port_layout.addWidget(self.baud_label)
         port_layout.addWidget(self.baud_combo)
+        port_layout.addWidget(self.framing_label)
+        port_layout.addWidget(self.framing_combo)
+        port_layout.addWidget(self.crc_label)
+        port_layout.addWidget(self.crc_combo)
+
+        # Multi-Port Capture
+        multi_layout = QHBoxLayout()
+        self.multi_port_list = QListWidget(self)
+        self.multi_port_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.multi_port_list.setMaximumHeight(60)
+
+        self.multi_mode_combo = QComboBox(self)
+        self.multi_mode_combo.addItems(list(MultiPortCapture.MODES))
+
+        self.multi_start_button = QPushButton("Start Multi-Port", self)
+        self.multi_start_button.clicked.connect(self.start_multi_capture)
+
+        self.multi_stop_button = QPushButton("Stop Multi-Port", self)
+        self.multi_stop_button.setEnabled(False)
+        self.multi_stop_button.clicked.connect(self.stop_multi_capture)
+
+        multi_layout.addWidget(QLabel("Multi-Port:", self))
+        multi_layout.addWidget(self.multi_port_list)
+        multi_layout.addWidget(QLabel("Reader:", self))
+        multi_layout.addWidget(self.multi_mode_combo)
+        multi_layout.addWidget(self.multi_start_button)
+        multi_layout.addWidget(self.multi_stop_button)
 
         # Data Display Boxes
         self.binary_display = QTextEdit(self)
@@ -77,7 +177,17 @@ class SerialMonitor(QMainWindow):
         self.save_button.setEnabled(False)
         self.save_button.clicked.connect(self.save_data)
 
+        self.record_button = QPushButton("Start Recording", self)
+        self.record_button.clicked.connect(self.toggle_recording)
+
+        self.open_capture_button = QPushButton("Open Capture", self)
+        self.open_capture_button.clicked.connect(self.open_capture)
+
+        self.stats_label = QLabel("Frames/s: - | Checksum errors: -", self)
+
         layout.addLayout(port_layout)
+        layout.addLayout(multi_layout)
+        layout.addWidget(self.stats_label)
         layout.addWidget(QLabel("Binary Data", self))
         layout.addWidget(self.binary_display)
         layout.addWidget(QLabel("Hexadecimal Data", self))
@@ -87,6 +197,8 @@ class SerialMonitor(QMainWindow):
         layout.addWidget(self.start_button)
         layout.addWidget(self.stop_button)
         layout.addWidget(self.save_button)
+        layout.addWidget(self.record_button)
+        layout.addWidget(self.open_capture_button)
 
         container = QWidget()
         container.setLayout(layout)
@@ -96,13 +208,25 @@ class SerialMonitor(QMainWindow):
         self.binary_data_list = []
         self.hex_data_list = []
         self.char_data_list = []
+        self.capture_writer = None
+        self.recorded_path = None
+        self.capture_reader = None
+        self.multi_capture = None
+        self.multi_emitter = MultiPortEmitter()
+        self.multi_emitter.data_received.connect(self.update_port_text)
+        self.multi_stats_timer = QTimer(self)
+        self.multi_stats_timer.timeout.connect(self.update_multi_stats)
+
+        self.refresh_ports()
 
     def refresh_ports(self):
         # Detect and populate the available serial ports
         ports = serial.tools.list_ports.comports()
         self.port_combo.clear()
+        self.multi_port_list.clear()
         for port in ports:
             self.port_combo.addItem(port.device)
+            self.multi_port_list.addItem(port.device)
 
     def start_monitoring(self):
         selected_port = self.port_combo.currentText()
@@ -112,14 +236,22 @@ class SerialMonitor(QMainWindow):
             self.serial_port.port = selected_port
             self.serial_port.baudrate = int(selected_baud)
             self.serial_port.open()
+            self.close_capture()
 
-            self.serial_thread = SerialThread(self.serial_port)
+            crc = self.crc_combo.currentText()
+            framer = create_framer(self.framing_combo.currentText(), None if crc == "None" else crc)
+
+            self.serial_thread = SerialThread(self.serial_port, framer)
+            self.serial_thread.set_capture_writer(self.capture_writer)
             self.serial_thread.data_received.connect(self.update_text)
+            self.serial_thread.frames_received.connect(self.update_frames)
+            self.serial_thread.frame_stats.connect(self.update_frame_stats)
             self.serial_thread.start()
 
             self.start_button.setEnabled(False)
             self.stop_button.setEnabled(True)
             self.save_button.setEnabled(True)
+            self.open_capture_button.setEnabled(False)
         else:
             self.char_display.append("No serial port selected.")
 
@@ -131,22 +263,144 @@ class SerialMonitor(QMainWindow):
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.save_button.setEnabled(False)
+        self.open_capture_button.setEnabled(True)
+
+    def start_multi_capture(self):
+        selected_ports = [item.text() for item in self.multi_port_list.selectedItems()]
+        if not selected_ports:
+            self.char_display.append("No serial ports selected for multi-port capture.")
+            return
+
+        capture = MultiPortCapture(self.multi_mode_combo.currentText(), on_data=self.multi_emitter.data_received.emit)
+        for port_name in selected_ports:
+            capture.add_port(port_name, int(self.baud_combo.currentText()))
+        try:
+            capture.start()
+        except serial.SerialException as e:
+            capture.stop()
+            self.char_display.append(f"Could not start multi-port capture: {str(e)}")
+            return
+
+        self.multi_capture = capture
+        self.multi_stats_timer.start(1000)
+        self.start_button.setEnabled(False)
+        self.multi_start_button.setEnabled(False)
+        self.multi_stop_button.setEnabled(True)
+        self.save_button.setEnabled(True)
+        # Capture records have no port name, so multi-port data is not recorded
+        self.record_button.setEnabled(False)
+
+    def stop_multi_capture(self):
+        if self.multi_capture:
+            self.multi_capture.stop()
+            self.multi_capture = None
+        self.multi_stats_timer.stop()
+        self.start_button.setEnabled(True)
+        self.multi_start_button.setEnabled(self.capture_writer is None)
+        self.multi_stop_button.setEnabled(False)
+        self.record_button.setEnabled(True)
+
+    def update_multi_stats(self):
+        if self.multi_capture:
+            per_port = ' | '.join(f"{stats.name}: {stats.throughput():.0f} B/s, {stats.errors} errors"
+                                  for stats in self.multi_capture.stats.values())
+            self.stats_label.setText(f"Total: {self.multi_capture.total_throughput():.0f} B/s | {per_port}")
+
+    def toggle_recording(self):
+        if self.capture_writer:
+            self.stop_recording()
+            return
+
+        capture_path, _ = QFileDialog.getSaveFileName(self, "Record Capture To", "capture.scap", "Serial Capture (*.scap)")
+        if capture_path:
+            self.capture_writer = CaptureWriter(capture_path)
+            self.capture_writer.start()
+            if self.serial_thread:
+                self.serial_thread.set_capture_writer(self.capture_writer)
+            # The capture file keeps everything, the displays only the latest lines
+            for display in (self.binary_display, self.hex_display, self.char_display):
+                display.document().setMaximumBlockCount(MAX_RECORDING_LINES)
+            self.record_button.setText("Stop Recording")
+            self.multi_start_button.setEnabled(False)
+            self.char_display.append(f"Recording to {capture_path}")
+
+    def stop_recording(self):
+        if self.capture_writer:
+            # Detach first so the reader cannot queue a chunk behind the writer's end marker
+            if self.serial_thread:
+                self.serial_thread.set_capture_writer(None)
+            self.capture_writer.stop()
+            self.char_display.append(f"Recorded {self.capture_writer.bytes_written} bytes to {self.capture_writer.path}")
+            self.recorded_path = self.capture_writer.path
+            self.capture_writer = None
+            self.multi_start_button.setEnabled(self.multi_capture is None)
+            for display in (self.binary_display, self.hex_display, self.char_display):
+                display.document().setMaximumBlockCount(0)
+        self.record_button.setText("Start Recording")
+
+    def open_capture(self):
+        capture_path, _ = QFileDialog.getOpenFileName(self, "Open Capture", "", "Serial Capture (*.scap)")
+        if not capture_path:
+            return
+
+        try:
+            reader = CaptureReader(capture_path)
+        except (OSError, ValueError) as e:
+            self.char_display.append(f"Could not open capture: {str(e)}")
+            return
+
+        self.close_capture()
+        self.capture_reader = reader
+        self.binary_display.clear()
+        self.hex_display.clear()
+        self.char_display.clear()
+        for index in range(min(len(reader), MAX_REPLAY_RECORDS)):
+            _, data = reader[index]
+            self.show_data(bytes(data))
+            data.release()
+        if len(reader) > MAX_REPLAY_RECORDS:
+            self.char_display.append(f"... showing {MAX_REPLAY_RECORDS} of {len(reader)} records, save to export all")
+        self.save_button.setEnabled(True)
+
+    def close_capture(self):
+        if self.capture_reader:
+            self.capture_reader.close()
+            self.capture_reader = None
+
+    def show_data(self, data, port_name=None):
+        binary_data = format_binary(data)
+        hex_data = format_hex(data)
+        char_data = format_char(data)
+        if port_name:
+            binary_data = f"[{port_name}] {binary_data}"
+            hex_data = f"[{port_name}] {hex_data}"
+            char_data = f"[{port_name}] {char_data}"
 
-    def update_text(self, data):
-        binary_data = ' '.join(f'{byte:08b}' for byte in data)
-        hex_data = ' '.join(f'{byte:02X}' for byte in data)
-        char_data = data.decode('utf-8', errors='replace')
-
-        # Append to the displays
         self.binary_display.append(binary_data)
         self.hex_display.append(hex_data)
         self.char_display.append(char_data)
+        return binary_data, hex_data, char_data
+
+    def update_port_text(self, port_name, timestamp, data):
+        self.update_text(data, port_name)
+
+    def update_text(self, data, port_name=None):
+        binary_data, hex_data, char_data = self.show_data(data, port_name)
+        if self.capture_writer is not None:
+            return  # Already in the capture file, don't also keep it in memory
 
         # Save the data in lists for later saving
         self.binary_data_list.append(binary_data)
         self.hex_data_list.append(hex_data)
         self.char_data_list.append(char_data)
 
+    def update_frames(self, frames):
+        for frame in frames:
+            self.update_text(frame)
+
+    def update_frame_stats(self, fps, checksum_errors):
+        self.stats_label.setText(f"Frames/s: {fps:.1f} | Checksum errors: {checksum_errors}")
+
     def save_data(self):
         save_directory = QFileDialog.getExistingDirectory(self, "Select Directory to Save Files")
 
@@ -155,6 +409,11 @@ class SerialMonitor(QMainWindow):
             hex_file_path = f"{save_directory}/hex_data.txt"
             char_file_path = f"{save_directory}/char_data.txt"
 
+            if self.capture_reader:
+                self.export_capture(self.capture_reader, save_directory)
+                self.char_display.append(f"Capture exported to {save_directory}")
+                return
+
             # Save Binary Data
             with open(binary_file_path, 'w') as binary_file:
                 binary_file.write('\n'.join(self.binary_data_list))
@@ -169,8 +428,30 @@ class SerialMonitor(QMainWindow):
 
             self.char_display.append(f"Data saved in {save_directory}")
 
+            # Recorded chunks were only written to the capture file, export them from there
+            capture_path = self.capture_writer.path if self.capture_writer else self.recorded_path
+            if capture_path:
+                try:
+                    reader = CaptureReader(capture_path)
+                except (OSError, ValueError) as e:
+                    self.char_display.append(f"Could not export recording {capture_path}: {str(e)}")
+                    return
+                try:
+                    self.export_capture(reader, save_directory, 'capture_')
+                finally:
+                    reader.close()
+                self.char_display.append(f"Recording {capture_path} exported to {save_directory}/capture_*.txt")
+
+    def export_capture(self, reader, save_directory, prefix=''):
+        # Stream the whole capture straight from the memory map
+        for fmt in ('binary', 'hex', 'char'):
+            reader.export(f"{save_directory}/{prefix}{fmt}_data.txt", fmt)
+
     def closeEvent(self, event):
         self.stop_monitoring()
+        self.stop_multi_capture()
+        self.stop_recording()
+        self.close_capture()
         event.accept()
 
 if __name__ == "__main__":
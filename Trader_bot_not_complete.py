@@ -5,13 +5,15 @@ import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QComboBox, QLineEdit, QPushButton, QProgressBar)
 from PyQt5.QtCore import pyqtSignal, QObject, Qt, QThread, QTimer
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import MinMaxScaler
 from tensorflow import keras
 from tensorflow.keras import layers
 from datetime import datetime
 import os
 import logging
+from worker_control import WorkerControl
+from bar_windows import FEATURE_COLUMNS, WINDOW, window_view, time_split, window_dataset
+from bar_cache import BarCache
 
 # Configure logging
 logging.basicConfig(filename='trading_bot.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -42,7 +44,9 @@ class TradingBotThread(QThread):
         self.predicted_price = None
         self.current_price = None
         self.signal_emitter = signal_emitter
-        self.running = True
+        self.control = WorkerControl()
+        self.bar_cache = BarCache('bar_cache', symbol, timeframe)
+        self.history_bars = 5000  # Bars loaded for training, None for the whole cache
 
     def run(self):
         self.signal_emitter.loading_screen.emit(True)
@@ -51,10 +55,10 @@ class TradingBotThread(QThread):
             self.fetch_historical_data()
             self.train_lstm()
             self.signal_emitter.loading_screen.emit(False)
-            while self.running:
+            # Wakes at once on stop instead of finishing a one second sleep
+            while self.control.sleep(1):
                 self.update_data()
                 self.make_trading_decision()
-                QThread.sleep(1)
         except Exception as e:
             logging.error(f"Error in trading bot: {str(e)}")
             self.signal_emitter.update_status.emit(f"Error in trading bot: {str(e)}")
@@ -71,28 +75,29 @@ class TradingBotThread(QThread):
 
     def fetch_historical_data(self):
         try:
-            rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, 5000)
-            if rates is None or len(rates) == 0:
+            # Only bars newer than the local cache are downloaded
+            added = self.bar_cache.sync(mt5, initial_bars=5000)
+            if not self.bar_cache.count:
                 raise ValueError("Failed to fetch historical data")
 
-            data = pd.DataFrame(rates)
-            data['time'] = pd.to_datetime(data['time'], unit='s')
-            self.data = data
-            self.signal_emitter.update_status.emit("Historical data fetched")
-            logging.info("Historical data fetched successfully")
+            self.data = self.bar_cache.frame(last=self.history_bars)
+            self.signal_emitter.update_status.emit(f"Historical data fetched ({added} new bars)")
+            logging.info(f"Historical data fetched successfully, {added} new of {self.bar_cache.count} cached bars")
         except Exception as e:
             logging.error(f"Error fetching historical data: {str(e)}")
             self.signal_emitter.update_status.emit(f"Error fetching historical data: {str(e)}")
 
     def update_data(self):
         try:
-            rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, 1)
-            if rates is None or len(rates) == 0:
+            # Everything since the last cached bar, so bars formed during training or a missed poll are kept
+            self.bar_cache.sync(mt5)
+            if not self.bar_cache.count:
                 raise ValueError("Failed to update data")
 
-            new_data = pd.DataFrame(rates)
-            new_data['time'] = pd.to_datetime(new_data['time'], unit='s')
-            self.data = pd.concat([self.data, new_data], ignore_index=True).drop_duplicates(subset=['time'])
+            last_time = self.data['time'].iloc[-1] if self.data is not None and not self.data.empty else None
+            new_data = self.bar_cache.frame(start=last_time)
+            # The last bar may have been refetched with newer prices
+            self.data = pd.concat([self.data, new_data], ignore_index=True).drop_duplicates(subset=['time'], keep='last')
             self.data = self.data.iloc[-1000:]
 
             self.update_predictions()
@@ -211,12 +216,8 @@ class TradingBotThread(QThread):
 
     def prepare_features(self):
         try:
-            features = []
-            for i in range(20, len(self.data)):
-                features.append(
-                    self.data[['open', 'high', 'low', 'close', 'tick_volume']].iloc[i - 20:i].values
-                )
-            return np.array(features)
+            # A view onto the bar array: one window per label row, without copying the bars 20 times
+            return window_view(self.data[FEATURE_COLUMNS].to_numpy(dtype=np.float32))[:-1]
         except Exception as e:
             logging.error(f"Error preparing features: {str(e)}")
             self.signal_emitter.update_status.emit(f"Error preparing features: {str(e)}")
@@ -229,13 +230,16 @@ class TradingBotThread(QThread):
 
             self.data['scaled_close'] = self.scaler.fit_transform(self.data[['close']])
 
-            features = self.prepare_features()
-            labels = self.data['scaled_close'].iloc[20:].values
+            values = self.data[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+            labels = self.data['scaled_close'].to_numpy(dtype=np.float32)
 
-            X_train, X_test, y_train, y_test = train_test_split(features, labels, test_size=0.2)
+            # Windows are gathered batch by batch, the test set is the most recent 20% of the bars
+            train_rows, test_rows = time_split(len(values), WINDOW, test_size=0.2)
+            train_data = window_dataset(values, labels, train_rows, WINDOW, batch_size=32, shuffle_buffer=len(train_rows))
+            test_data = window_dataset(values, labels, test_rows, WINDOW, batch_size=32)
 
             model = keras.Sequential([
-                layers.LSTM(50, activation='relu', input_shape=(20, 5)),
+                layers.LSTM(50, activation='relu', input_shape=(WINDOW, len(FEATURE_COLUMNS))),
                 layers.Dropout(0.2),
                 layers.Dense(32, activation='relu'),
                 layers.Dropout(0.2),
@@ -243,7 +247,7 @@ class TradingBotThread(QThread):
             ])
 
             model.compile(optimizer='adam', loss='mse')
-            model.fit(X_train, y_train, epochs=20, batch_size=32)
+            model.fit(train_data, validation_data=test_data, epochs=20)
 
             self.model = model
             self.signal_emitter.update_status.emit("LSTM model trained")
@@ -258,7 +262,7 @@ class TradingBotThread(QThread):
             if features.size == 0:
                 return
 
-            prediction = self.model.predict(features[-1].reshape(1, 20, 5))
+            prediction = self.model.predict(features[-1].reshape(1, WINDOW, len(FEATURE_COLUMNS)))
             predicted_scaled_price = prediction.flatten()[0]
             predicted_price = self.scaler.inverse_transform([[predicted_scaled_price]])[0][0]
             current_price = self.data['close'].iloc[-1]
@@ -315,7 +319,7 @@ class TradingBotThread(QThread):
             self.signal_emitter.update_status.emit(f"Error saving to Excel: {str(e)}")
 
     def stop(self):
-        self.running = False
+        self.control.stop()
         self.quit()
         self.wait()
 
@@ -469,11 +473,11 @@ class TradingBotUI(QMainWindow):
 
     def continuous_trade(self):
         if self.trading_bot_thread:
-            self.trading_bot_thread.running = True
+            self.trading_bot_thread.control.resume()
             self.continuous_trading_loop()
 
     def continuous_trading_loop(self):
-        if self.trading_bot_thread and self.trading_bot_thread.running:
+        if self.trading_bot_thread and not self.trading_bot_thread.control.stop_requested:
             self.trading_bot_thread.make_trading_decision()
             QTimer.singleShot(60000, self.continuous_trading_loop)  # 1-minute interval between trades
 
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+
+def to_seconds(value):
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    return int(value.timestamp())
+
+
+class BarCache:
+    """On-disk bar history for one symbol and timeframe.
+
+    Each field of the MT5 rates array (time, open, high, low, close,
+    tick_volume, ...) is a raw binary column file, so any column can be
+    memory-mapped and sliced without reading the rest. meta.json holds the
+    dtype and the number of bars; it is replaced last on every append, so
+    bars written by an interrupted append are ignored and overwritten.
+    """
+
+    def __init__(self, root, symbol, timeframe):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.path = os.path.join(root, f"{symbol}_{timeframe}")
+        self.dtype = None
+        self.count = 0
+        meta_path = os.path.join(self.path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+            self.dtype = np.dtype([tuple(field) for field in meta['dtype']])
+            self.count = meta['count']
+
+    def column_path(self, name):
+        return os.path.join(self.path, name + '.bin')
+
+    def save_meta(self):
+        meta_path = os.path.join(self.path, 'meta.json')
+        with open(meta_path + '.tmp', 'w') as meta_file:
+            json.dump({'symbol': self.symbol, 'timeframe': self.timeframe,
+                       'dtype': self.dtype.descr, 'count': self.count}, meta_file)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def column(self, name):
+        """The whole column as a read-only memory map."""
+        if not self.count:
+            return np.empty(0, self.dtype[name] if self.dtype else np.int64)
+        return np.memmap(self.column_path(name), dtype=self.dtype[name], mode='r', shape=(self.count,))
+
+    def last_time(self):
+        return int(self.column('time')[-1]) if self.count else None
+
+    def append(self, rates):
+        """Add bars newer than the cache; returns how many new bars were stored.
+
+        A bar with the same time as the last cached one replaces it, since
+        that bar was probably still forming when it was fetched.
+        """
+        rates = np.asarray(rates)
+        if not len(rates):
+            return 0
+        if self.dtype is None:
+            self.dtype = rates.dtype
+            os.makedirs(self.path, exist_ok=True)
+        count = self.count
+        last = self.last_time()
+        if last is not None:
+            rates = rates[rates['time'] >= last]
+            if len(rates) and rates['time'][0] == last:
+                count -= 1
+        if not len(rates):
+            return 0
+        for name in self.dtype.names:
+            offset = count * self.dtype[name].itemsize
+            with open(self.column_path(name), 'ab') as column_file:
+                # Drops the replaced bar and anything left over from an interrupted append
+                column_file.truncate(offset)
+                column_file.write(np.ascontiguousarray(rates[name], dtype=self.dtype[name]).tobytes())
+        added = count + len(rates) - self.count
+        self.count = count + len(rates)
+        self.save_meta()
+        return added
+
+    def columns(self, start=None, end=None, last=None, names=None):
+        """Memory-mapped column slices for start <= time < end (datetimes or Unix seconds).
+
+        last keeps only the most recent `last` bars of that range. The slices
+        share memory with the cache files, nothing is read until it is used.
+        """
+        times = self.column('time')
+        first = 0 if start is None else int(np.searchsorted(times, to_seconds(start), 'left'))
+        stop = len(times) if end is None else int(np.searchsorted(times, to_seconds(end), 'left'))
+        if last is not None:
+            first = max(first, stop - last)
+        if self.dtype is None:
+            return {}
+        return {name: self.column(name)[first:stop] for name in names or self.dtype.names}
+
+    def frame(self, start=None, end=None, last=None):
+        # Same layout as a DataFrame of copy_rates_* output, for code that expects one
+        import pandas as pd
+
+        data = pd.DataFrame(self.columns(start, end, last))
+        if 'time' in data:
+            data['time'] = pd.to_datetime(data['time'], unit='s')
+        return data
+
+    def sync(self, mt5, initial_bars=5000):
+        """Download only the bars after the last cached one; returns how many were added."""
+        last = self.last_time()
+        if last is None:
+            rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, initial_bars)
+        else:
+            # Bar times are broker server time, which can be ahead of UTC, so ask past now
+            rates = mt5.copy_rates_range(self.symbol, self.timeframe,
+                                         datetime.fromtimestamp(last, timezone.utc),
+                                         datetime.now(timezone.utc) + timedelta(days=1))
+        if rates is None:
+            raise RuntimeError(f"Failed to fetch bars for {self.symbol}: {mt5.last_error()}")
+        return self.append(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the cached bar history")
+    parser.add_argument('--root', default='bar_cache')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"No cache in {args.root}")
+        return
+    for name in sorted(os.listdir(args.root)):
+        meta_path = os.path.join(args.root, name, 'meta.json')
+        if not os.path.exists(meta_path):
+            continue
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        cache = BarCache(args.root, meta['symbol'], meta['timeframe'])
+        times = cache.column('time')
+        span = ""
+        if cache.count:
+            span = (f"  {datetime.fromtimestamp(int(times[0]), timezone.utc):%Y-%m-%d %H:%M} .. "
+                    f"{datetime.fromtimestamp(int(times[-1]), timezone.utc):%Y-%m-%d %H:%M}")
+        print(f"{meta['symbol']:12} timeframe {meta['timeframe']:>6}  {cache.count:>10,} bars{span}")
+
+
+if __name__ == "__main__":
+    main()
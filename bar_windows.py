@@ -0,0 +1,95 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+
+FEATURE_COLUMNS = ['open', 'high', 'low', 'close', 'tick_volume']
+WINDOW = 20
+
+
+def window_view(values, window=WINDOW):
+    """Every window of `window` consecutive rows as a (N - window + 1, window, columns) view, no copy."""
+    return np.lib.stride_tricks.sliding_window_view(values, (window, values.shape[1]))[:, 0]
+
+
+def time_split(rows, window=WINDOW, test_size=0.2):
+    """Label rows for training and testing, oldest first, so the test set is never older than the training set.
+
+    A label row i is predicted from rows i - window .. i - 1.
+    """
+    labelled = np.arange(window, rows)
+    split = len(labelled) - int(round(len(labelled) * test_size))
+    return labelled[:split], labelled[split:]
+
+
+def gather_windows(values, rows, window=WINDOW):
+    # (batch, window, columns) for just these label rows
+    return values[rows[:, np.newaxis] + np.arange(-window, 0)]
+
+
+def window_batches(values, targets, rows, window=WINDOW, batch_size=32, shuffle=False, seed=None):
+    """Yield (windows, targets) batches, building each batch's windows on the fly.
+
+    Only the label row numbers are shuffled, so memory stays at one batch of
+    windows however long the bar history is.
+    """
+    if shuffle:
+        rows = np.random.default_rng(seed).permutation(rows)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        yield gather_windows(values, batch, window), targets[batch]
+
+
+def window_dataset(values, targets, rows, window=WINDOW, batch_size=32, shuffle_buffer=0, seed=None):
+    """tf.data version of window_batches for model.fit, with a shuffle buffer and prefetch.
+
+    The bars are held once as a tensor; each batch of windows is gathered
+    from it in the input pipeline while the previous batch trains.
+    """
+    import tensorflow as tf
+
+    values = tf.constant(values, tf.float32)
+    targets = tf.constant(targets, tf.float32)
+    offsets = tf.range(-window, 0, dtype=tf.int64)
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(rows, np.int64))
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(lambda batch: (tf.gather(values, batch[:, tf.newaxis] + offsets), tf.gather(targets, batch)),
+                          num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of materialized LSTM windows vs streamed batches")
+    parser.add_argument('--bars', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = rng.random((args.bars, len(FEATURE_COLUMNS)), dtype=np.float32)
+    targets = values[:, 3].copy()
+    train_rows, test_rows = time_split(len(values))
+    print(f"{args.bars:,} bars: {values.nbytes / 2 ** 20:.1f} MiB of bars, "
+          f"{len(train_rows):,} training windows, {len(test_rows):,} test windows")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    materialized = np.array(window_view(values)[:-1])
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    del materialized
+    tracemalloc.stop()
+    print(f"materialized  {seconds:6.2f} s  peak {peak / 2 ** 20:8.1f} MiB")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    batches = sum(1 for _ in window_batches(values, targets, train_rows, batch_size=args.batch_size, shuffle=True))
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"streamed      {seconds:6.2f} s  peak {peak / 2 ** 20:8.1f} MiB  ({batches:,} batches of {args.batch_size})")
+
+
+if __name__ == "__main__":
+    main()
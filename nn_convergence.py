@@ -0,0 +1,78 @@
+import time
+
+
+class ConvergenceTracker:
+    """Per-epoch loss bookkeeping shared by the Keras and NumPy backends.
+
+    Call update() once per epoch with the training loss. It keeps the loss
+    curve, remembers when the loss first reached target_loss and returns
+    True once the loss has not improved by more than min_delta for patience
+    epochs. The best weights seen are kept so they can be restored after
+    stopping.
+    """
+
+    def __init__(self, patience=None, min_delta=0.0, target_loss=None):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.target_loss = target_loss
+        self.started = time.perf_counter()
+        self.losses = []
+        self.best_loss = None
+        self.best_epoch = None
+        self.best_weights = None
+        self.wait = 0
+        self.stopped_epoch = None
+        self.target_epoch = None
+        self.target_seconds = None
+
+    @property
+    def epochs(self):
+        return len(self.losses)
+
+    def update(self, loss, get_weights=None):
+        loss = float(loss)
+        self.losses.append(loss)
+        epoch = len(self.losses)
+        if self.target_loss is not None and self.target_epoch is None and loss <= self.target_loss:
+            self.target_epoch = epoch
+            self.target_seconds = round(time.perf_counter() - self.started, 3)
+        if self.best_loss is None or loss < self.best_loss - self.min_delta:
+            self.best_loss = loss
+            self.best_epoch = epoch
+            self.wait = 0
+            if get_weights is not None and self.patience is not None:
+                self.best_weights = get_weights()
+        else:
+            self.wait += 1
+            if self.patience is not None and self.wait >= self.patience:
+                self.stopped_epoch = epoch
+        return self.stopped_epoch is not None
+
+    def curve(self, points=200):
+        # Every step-th epoch plus the last one, so long runs stay small on disk
+        step = max(1, len(self.losses) // points)
+        epochs = list(range(step, len(self.losses) + 1, step))
+        if self.losses and epochs[-1] != len(self.losses):
+            epochs.append(len(self.losses))
+        return [[epoch, self.losses[epoch - 1]] for epoch in epochs]
+
+    def summary(self, points=200):
+        return {
+            'epochs_run': self.epochs,
+            'best_epoch': self.best_epoch,
+            'best_loss': self.best_loss,
+            'stopped_epoch': self.stopped_epoch,
+            'target_epoch': self.target_epoch,
+            'target_seconds': self.target_seconds,
+            'loss_curve': self.curve(points),
+        }
+
+
+def keras_callback(tracker, model):
+    import keras
+
+    def on_epoch_end(epoch, logs):
+        if tracker.update(logs['loss'], model.get_weights):
+            model.stop_training = True
+
+    return keras.callbacks.LambdaCallback(on_epoch_end=on_epoch_end)
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+from nn_convergence import ConvergenceTracker, keras_callback
+
+# name -> (function, default low, default high); the ranges are the notebooks'
+TARGETS = {
+    'square': (np.square, -20.0, 20.0),  # Question 3
+    'reciprocal': (lambda x: np.divide(1, x), -0.5, 0.5),  # Question 5.1
+    'sign': (np.sign, -2.0, 2.0),  # Question 5.2
+    'sinc': (np.sinc, -6.0, 6.0),  # Question 5.3
+}
+
+# Hidden layers as (units, activation), followed by a linear Dense(1) output
+ARCHITECTURES = {
+    'q3': ((50, 'tanh'),),
+    'q5': ((30, 'sigmoid'), (20, 'sigmoid'), (10, 'sigmoid')),
+}
+
+# The notebook setups: epochs per round, and rounds of fit + report
+PRESETS = {
+    'q3': dict(target='square', architecture='q3', epochs=75, rounds=4),
+    'q5_1': dict(target='reciprocal', architecture='q5', epochs=10000, rounds=3),
+    'q5_2': dict(target='sign', architecture='q5', epochs=10000, rounds=3),
+    'q5_3': dict(target='sinc', architecture='q5', epochs=10000, rounds=3),
+}
+
+
+def parse_layers(text):
+    # "30:sigmoid,20:sigmoid" -> ((30, 'sigmoid'), (20, 'sigmoid'))
+    layers = []
+    for part in text.split(','):
+        units, _, activation = part.partition(':')
+        layers.append((int(units), activation or 'tanh'))
+    return tuple(layers)
+
+
+def make_config(target, low=None, high=None, architecture='q5', layers=None, epochs=100, rounds=1,
+                batch_size=10, samples=1000, seed=None, backend='keras', learning_rate=0.001,
+                patience=None, min_delta=0.0, target_mse=None):
+    """Everything that defines one experiment, as a plain JSON-able dict."""
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target: {target}")
+    if backend not in ('keras', 'numpy'):
+        raise ValueError(f"Unknown backend: {backend}")
+    _, default_low, default_high = TARGETS[target]
+    if layers is None:
+        layers = ARCHITECTURES[architecture]
+    return {
+        'target': target,
+        'low': default_low if low is None else low,
+        'high': default_high if high is None else high,
+        'layers': [[units, activation] for units, activation in layers],
+        'epochs': epochs,
+        'rounds': rounds,
+        'batch_size': batch_size,
+        'samples': samples,
+        'seed': seed,
+        'backend': backend,
+        'learning_rate': learning_rate,
+        'patience': patience,
+        'min_delta': min_delta,
+        'target_mse': target_mse,
+    }
+
+
+def make_dataset(config):
+    from sklearn.preprocessing import MinMaxScaler
+
+    function = TARGETS[config['target']][0]
+    x = np.linspace(config['low'], config['high'], config['samples'])[:, np.newaxis]
+    y = function(x).reshape((len(x), 1))
+    # separately scale the input and output variables
+    scale_x = MinMaxScaler()
+    scale_y = MinMaxScaler()
+    return scale_x.fit_transform(x), scale_y.fit_transform(y), scale_x, scale_y
+
+
+def build_model(config):
+    if config['backend'] == 'numpy':
+        from nn_numpy import NumpyMLP
+        return NumpyMLP(config['layers'], learning_rate=config['learning_rate'], seed=config['seed'])
+
+    # Imported here so a process can set TensorFlow's thread limits before it loads
+    import keras
+    from keras.models import Sequential
+    from keras.layers import Dense, Input
+
+    model = Sequential()
+    model.add(Input(shape=(1,)))
+    for units, activation in config['layers']:
+        model.add(Dense(units, activation=activation, kernel_initializer='he_uniform'))
+    model.add(Dense(1))
+    model.compile(loss='mse', optimizer=keras.optimizers.Adam(learning_rate=config['learning_rate']))
+    return model
+
+
+def plot_fit(x, y, yhat, title, path=None):
+    import matplotlib
+    if path:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    plt.plot(x, y, 'r-', x, yhat, 'b-')
+    plt.title(title)
+    plt.legend(['y', 'y_predict'])
+    plt.xlabel('x')
+    plt.ylabel('y')
+    if path:
+        plt.savefig(path)
+        plt.close()
+    else:
+        plt.show()
+
+
+def run_experiment(config, plot=False, plot_dir=None):
+    """Train one model as the notebooks do and return its metrics.
+
+    The MSE is reported in the original units after every round of
+    config['epochs'] epochs. With config['patience'] set, training stops
+    once the loss has not improved by min_delta for that many epochs and
+    the best weights are restored. The result also holds the loss curve and
+    the epoch and time at which config['target_mse'] was first reached.
+    plot shows each round's fit, plot_dir saves the figures there instead.
+    """
+    from sklearn.metrics import mean_squared_error
+
+    numpy_backend = config['backend'] == 'numpy'
+    if config['seed'] is not None and not numpy_backend:
+        import keras
+        keras.utils.set_random_seed(config['seed'])
+    x, y, scale_x, scale_y = make_dataset(config)
+    model = build_model(config)
+    x_plot = scale_x.inverse_transform(x)
+    y_plot = scale_y.inverse_transform(y)
+
+    # The loss is the MSE of min-max scaled targets, so a target in original units is a fixed loss
+    target_loss = None
+    if config['target_mse'] is not None:
+        target_loss = config['target_mse'] / float(scale_y.data_range_[0]) ** 2
+    tracker = ConvergenceTracker(config['patience'], config['min_delta'], target_loss)
+
+    rounds = []
+    started = time.perf_counter()
+    for round_index in range(config['rounds']):
+        if numpy_backend:
+            model.fit(x, y, epochs=config['epochs'], batch_size=config['batch_size'],
+                      callback=lambda epoch, losses: tracker.update(losses[0], model.get_weights))
+        else:
+            model.fit(x, y, epochs=config['epochs'], batch_size=config['batch_size'], verbose=0,
+                      callbacks=[keras_callback(tracker, model)])
+        if tracker.stopped_epoch is not None and tracker.best_weights is not None:
+            model.set_weights(tracker.best_weights)
+        yhat = model.predict(x) if numpy_backend else model.predict(x, verbose=0)
+        yhat_plot = scale_y.inverse_transform(yhat)
+        rounds.append({
+            'round': round_index + 1,
+            'epochs': tracker.epochs,
+            'loss': tracker.losses[-1],
+            'mse': float(mean_squared_error(y_plot, yhat_plot)),
+            'seconds': round(time.perf_counter() - started, 3),
+        })
+        if plot or plot_dir:
+            path = None
+            if plot_dir:
+                os.makedirs(plot_dir, exist_ok=True)
+                path = os.path.join(plot_dir, f"{config['target']}_round{round_index + 1}.png")
+            plot_fit(x_plot, y_plot, yhat_plot, 'real vs approximation', path)
+        if tracker.stopped_epoch is not None:
+            break
+
+    result = {
+        'config': config,
+        'rounds': rounds,
+        'mse': rounds[-1]['mse'] if rounds else None,
+        'train_seconds': round(time.perf_counter() - started, 3),
+    }
+    result.update(tracker.summary())
+    return result
+
+
+def append_results(results, path):
+    # One JSON object per line, so runs can be appended and compared later
+    with open(path, 'a') as results_file:
+        for result in results:
+            results_file.write(json.dumps(result) + '\n')
+
+
+def load_results(path):
+    with open(path) as results_file:
+        return [json.loads(line) for line in results_file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Function approximation experiments from the NN_final notebooks")
+    parser.add_argument('--preset', choices=sorted(PRESETS), help="Reproduce one notebook")
+    parser.add_argument('--target', choices=sorted(TARGETS))
+    parser.add_argument('--low', type=float)
+    parser.add_argument('--high', type=float)
+    parser.add_argument('--architecture', choices=sorted(ARCHITECTURES))
+    parser.add_argument('--layers', type=parse_layers, help="Hidden layers, e.g. 30:sigmoid,20:sigmoid")
+    parser.add_argument('--epochs', type=int)
+    parser.add_argument('--rounds', type=int)
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--samples', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--backend', choices=('keras', 'numpy'), help="Train with Keras or the NumPy MLP in nn_numpy.py")
+    parser.add_argument('--learning-rate', type=float)
+    parser.add_argument('--patience', type=int, help="Stop after this many epochs without improvement")
+    parser.add_argument('--min-delta', type=float, help="Smallest loss decrease that counts as improvement")
+    parser.add_argument('--target-mse', type=float, help="Record when the MSE (original units) first gets this low")
+    parser.add_argument('--plot', action='store_true', help="Show a fit plot after every round")
+    parser.add_argument('--plot-dir', help="Save the fit plots here instead of showing them")
+    parser.add_argument('--results', default='nn_results.jsonl', help="Metrics file, one JSON line per run")
+    args = parser.parse_args()
+
+    options = dict(PRESETS[args.preset]) if args.preset else {}
+    for name in ('target', 'low', 'high', 'architecture', 'layers', 'epochs', 'rounds', 'batch_size', 'samples', 'seed',
+                 'backend', 'learning_rate', 'patience', 'min_delta', 'target_mse'):
+        value = getattr(args, name)
+        if value is not None:
+            options[name] = value
+    if 'target' not in options:
+        parser.error("Give --preset or --target")
+
+    result = run_experiment(make_config(**options), plot=args.plot, plot_dir=args.plot_dir)
+    for metrics in result['rounds']:
+        print(f"Round {metrics['round']}: {metrics['epochs']} epochs  MSE: {metrics['mse']:.6f}  "
+              f"({metrics['seconds']:.1f} s)")
+    if result['stopped_epoch'] is not None:
+        print(f"Stopped at epoch {result['stopped_epoch']}, restored epoch {result['best_epoch']}")
+    if result['target_epoch'] is not None:
+        print(f"Target MSE reached at epoch {result['target_epoch']} ({result['target_seconds']:.1f} s)")
+    append_results([result], args.results)
+
+
+if __name__ == "__main__":
+    main()
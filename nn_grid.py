@@ -0,0 +1,148 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from nn_experiments import ARCHITECTURES, TARGETS, make_config, run_experiment, append_results
+
+
+def config_hash(config):
+    # Same settings -> same file name, whatever order the keys were built in
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def cache_path(cache_dir, config):
+    return os.path.join(cache_dir, config_hash(config) + '.json')
+
+
+def load_cached(cache_dir, config):
+    path = cache_path(cache_dir, config)
+    if not os.path.exists(path):
+        return None
+    with open(path) as cache_file:
+        return json.load(cache_file)
+
+
+def thread_limits(threads):
+    # Environment that caps the BLAS/OpenMP and TensorFlow thread pools of one worker
+    limits = {name: str(threads) for name in
+              ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS')}
+    limits['TF_NUM_INTEROP_THREADS'] = '1'
+    limits['TF_CPP_MIN_LOG_LEVEL'] = os.environ.get('TF_CPP_MIN_LOG_LEVEL', '2')
+    return limits
+
+
+def run_job(config, cache_dir):
+    result = run_experiment(config)
+    result['pid'] = os.getpid()
+    # Write then rename, so an interrupted sweep never leaves a half-written cell behind
+    path = cache_path(cache_dir, config)
+    with open(path + '.tmp', 'w') as cache_file:
+        json.dump(result, cache_file)
+    os.replace(path + '.tmp', path)
+    return result
+
+
+def make_grid(targets, architectures, seeds, **options):
+    return [make_config(target, architecture=architecture, seed=seed, **options)
+            for target in targets for architecture in architectures for seed in seeds]
+
+
+def run_grid(configs, cache_dir, jobs, threads_per_job, on_result=None, job=run_job):
+    """Run every config not already in cache_dir on a process pool; returns all results.
+
+    job(config, cache_dir) runs in the workers and must be importable there.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    results = []
+    pending = []
+    for config in configs:
+        cached = load_cached(cache_dir, config)
+        if cached is not None:
+            results.append(cached)
+        else:
+            pending.append(config)
+    if on_result is not None:
+        for result in results:
+            on_result(result, cached=True)
+    if not pending:
+        return results
+
+    # spawn gives every worker a fresh interpreter, TensorFlow does not survive fork
+    context = multiprocessing.get_context('spawn')
+    # A worker imports numpy while unpickling its first job, before any initializer could
+    # run, so the limits have to be in the environment the workers are started with
+    limits = thread_limits(threads_per_job)
+    saved = {name: os.environ.get(name) for name in limits}
+    os.environ.update(limits)
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+            futures = {executor.submit(job, config, cache_dir): config for config in pending}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'config': futures[future], 'error': str(e)}
+                results.append(result)
+                if on_result is not None:
+                    on_result(result, cached=False)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return results
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Run a grid of function-approximation experiments in parallel")
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument('--architectures', nargs='+', choices=sorted(ARCHITECTURES), default=sorted(ARCHITECTURES))
+    parser.add_argument('--seeds', type=int, default=3, help="Seeds 0..N-1 per cell")
+    parser.add_argument('--epochs', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=10, help="0 for full batch with the numpy backend")
+    parser.add_argument('--backend', choices=('keras', 'numpy'), default='keras')
+    parser.add_argument('--learning-rate', type=float, default=0.001)
+    parser.add_argument('--patience', type=int, help="Stop a run after this many epochs without improvement")
+    parser.add_argument('--min-delta', type=float, default=0.0)
+    parser.add_argument('--target-mse', type=float, help="Compare runs by the time they take to reach this MSE")
+    parser.add_argument('--jobs', type=int, default=cpus, help="Worker processes")
+    parser.add_argument('--threads-per-job', type=int, help="Math library threads per worker (default: cores / jobs)")
+    parser.add_argument('--cache-dir', default='nn_cache')
+    parser.add_argument('--results', help="Also append every result to this JSON-lines file")
+    args = parser.parse_args()
+
+    configs = make_grid(args.targets, args.architectures, range(args.seeds),
+                        epochs=args.epochs, rounds=args.rounds, batch_size=args.batch_size,
+                        backend=args.backend, learning_rate=args.learning_rate,
+                        patience=args.patience, min_delta=args.min_delta, target_mse=args.target_mse)
+    threads = args.threads_per_job or max(1, cpus // args.jobs)
+    started = time.perf_counter()
+
+    def report(result, cached):
+        config = result['config']
+        layers = '-'.join(str(units) for units, _ in config['layers'])
+        if 'error' in result:
+            outcome = f"FAILED: {result['error']}"
+        else:
+            outcome = f"MSE {result['mse']:.6f}  {result['epochs_run']} epochs  {result['train_seconds']:.1f} s"
+            if result['target_epoch'] is not None:
+                outcome += f"  target at epoch {result['target_epoch']} ({result['target_seconds']:.1f} s)"
+            if cached:
+                outcome += " (cached)"
+        print(f"{config['target']:10} {layers:10} seed {config['seed']}  {outcome}")
+
+    print(f"{len(configs)} experiments, {args.jobs} processes x {threads} threads")
+    results = run_grid(configs, args.cache_dir, args.jobs, threads, on_result=report)
+    print(f"Done in {time.perf_counter() - started:.1f} s")
+    if args.results:
+        append_results(results, args.results)
+
+
+if __name__ == "__main__":
+    main()
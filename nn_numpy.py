@@ -0,0 +1,193 @@
+import argparse
+import time
+import numpy as np
+
+# activation -> (function, derivative written in terms of the function's output)
+ACTIVATIONS = {
+    'tanh': (np.tanh, lambda a: 1 - a * a),
+    'sigmoid': (lambda z: 1 / (1 + np.exp(-z)), lambda a: a * (1 - a)),
+    'relu': (lambda z: np.maximum(z, 0), lambda a: (a > 0).astype(a.dtype)),
+    'linear': (lambda z: z, None),
+}
+
+
+class NumpyMLP:
+    """Dense regression network trained with Adam, in plain NumPy.
+
+    Built like nn_experiments.build_model: hidden layers with He-uniform
+    weights, a linear Dense(1) output with Glorot-uniform weights, zero
+    biases, MSE loss and Keras' Adam defaults. models > 1 trains that many
+    independent networks at once; every weight is then a stacked
+    (models, fan_in, fan_out) tensor and one matmul steps all of them.
+    """
+
+    def __init__(self, layers, models=1, learning_rate=0.001, seed=None,
+                 beta_1=0.9, beta_2=0.999, epsilon=1e-7):
+        self.rng = np.random.default_rng(seed)
+        self.models = models
+        self.learning_rate = learning_rate
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+        self.activations = [activation for _, activation in layers] + ['linear']
+        sizes = [1] + [units for units, _ in layers] + [1]
+        self.weights = []
+        self.biases = []
+        for index, (fan_in, fan_out) in enumerate(zip(sizes, sizes[1:])):
+            if index < len(layers):
+                limit = np.sqrt(6 / fan_in)  # he_uniform
+            else:
+                limit = np.sqrt(6 / (fan_in + fan_out))  # glorot_uniform, Dense's default
+            self.weights.append(self.rng.uniform(-limit, limit, (models, fan_in, fan_out)))
+            self.biases.append(np.zeros((models, 1, fan_out)))
+        self.params = self.weights + self.biases
+        self.m = [np.zeros_like(p) for p in self.params]
+        self.v = [np.zeros_like(p) for p in self.params]
+        self.iterations = 0
+
+    def forward(self, x):
+        # x is (n, 1) shared by all models, or (models, n, 1); returns every layer's output
+        outputs = [x]
+        for weights, biases, activation in zip(self.weights, self.biases, self.activations):
+            outputs.append(ACTIVATIONS[activation][0](outputs[-1] @ weights + biases))
+        return outputs
+
+    def predict(self, x):
+        """(n, 1) predictions for a single model, (models, n, 1) for a stack."""
+        yhat = self.forward(x)[-1]
+        return yhat[0] if self.models == 1 else yhat
+
+    def train_step(self, x, y):
+        outputs = self.forward(x)
+        error = outputs[-1] - y
+        losses = np.mean(error * error, axis=(1, 2))
+        delta = 2 * error / len(x)
+        weight_grads = []
+        bias_grads = []
+        for layer in reversed(range(len(self.weights))):
+            derivative = ACTIVATIONS[self.activations[layer]][1]
+            if derivative is not None:
+                delta = delta * derivative(outputs[layer + 1])
+            weight_grads.append(np.swapaxes(outputs[layer], -1, -2) @ delta)
+            bias_grads.append(delta.sum(axis=1, keepdims=True))
+            if layer:
+                delta = delta @ np.swapaxes(self.weights[layer], -1, -2)
+        self.apply_gradients(weight_grads[::-1] + bias_grads[::-1])
+        return losses
+
+    def apply_gradients(self, grads):
+        self.iterations += 1
+        t = self.iterations
+        step = self.learning_rate * np.sqrt(1 - self.beta_2 ** t) / (1 - self.beta_1 ** t)
+        for param, grad, m, v in zip(self.params, grads, self.m, self.v):
+            m *= self.beta_1
+            m += (1 - self.beta_1) * grad
+            v *= self.beta_2
+            v += (1 - self.beta_2) * grad * grad
+            param -= step * m / (np.sqrt(v) + self.epsilon)
+
+    def get_weights(self):
+        return [param.copy() for param in self.params]
+
+    def set_weights(self, weights):
+        for param, value in zip(self.params, weights):
+            param[...] = value
+
+    def fit(self, x, y, epochs=1, batch_size=None, shuffle=True, callback=None):
+        """Train like keras.Model.fit; batch_size None is full-batch.
+
+        callback(epoch, losses) is called after every epoch and stops the
+        training by returning True. Returns the mean training loss of every
+        epoch run, shape (epochs, models).
+        """
+        batch_size = batch_size or len(x)
+        history = np.empty((epochs, self.models))
+        for epoch in range(epochs):
+            order = self.rng.permutation(len(x)) if shuffle and batch_size < len(x) else np.arange(len(x))
+            total = np.zeros(self.models)
+            for start in range(0, len(x), batch_size):
+                batch = order[start:start + batch_size]
+                total += self.train_step(x[batch], y[batch]) * len(batch)
+            history[epoch] = total / len(x)
+            if callback is not None and callback(epoch, history[epoch]):
+                return history[:epoch + 1]
+        return history
+
+
+def original_mse(model, x, y, scale_y):
+    # MSE in the target's own units for every model, as the notebooks report it
+    yhat = model.predict(x).reshape(model.models, len(x), 1)
+    y_plot = scale_y.inverse_transform(y)
+    return [float(np.mean((scale_y.inverse_transform(yhat[index]) - y_plot) ** 2))
+            for index in range(model.models)]
+
+
+def train_until(model, x, y, scale_y, target_mse, max_epochs, batch_size, check_every):
+    """Fit until every model reaches target_mse; returns (epochs, seconds, MSE per model)."""
+    started = time.perf_counter()
+    epochs = 0
+    mse = original_mse(model, x, y, scale_y)
+    while epochs < max_epochs and max(mse) > target_mse:
+        chunk = min(check_every, max_epochs - epochs)
+        model.fit(x, y, epochs=chunk, batch_size=batch_size)
+        epochs += chunk
+        mse = original_mse(model, x, y, scale_y)
+    return epochs, time.perf_counter() - started, mse
+
+
+def main():
+    from nn_experiments import ARCHITECTURES, PRESETS, TARGETS, make_config, make_dataset, run_experiment
+
+    parser = argparse.ArgumentParser(description="NumPy MLP trainer vs Keras at matching MSE")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='q5_3')
+    parser.add_argument('--target', choices=sorted(TARGETS))
+    parser.add_argument('--architecture', choices=sorted(ARCHITECTURES))
+    parser.add_argument('--epochs', type=int, default=500, help="Keras reference: epochs at the notebook batch size")
+    parser.add_argument('--target-mse', type=float, help="Skip the Keras reference and aim for this MSE")
+    parser.add_argument('--batch-size', type=int, help="NumPy batch size (default: full batch)")
+    parser.add_argument('--learning-rate', type=float, default=0.01)
+    parser.add_argument('--models', type=int, default=16, help="Models trained at once in the stacked run")
+    parser.add_argument('--max-epochs', type=int, default=50000)
+    parser.add_argument('--check-every', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    options = dict(PRESETS[args.preset], epochs=args.epochs, rounds=1, seed=args.seed)
+    if args.target:
+        options['target'] = args.target
+    if args.architecture:
+        options['architecture'] = args.architecture
+    config = make_config(**options)
+    x, y, _, scale_y = make_dataset(config)
+    layers = config['layers']
+    print(f"{config['target']}, layers {'-'.join(str(units) for units, _ in layers)}")
+
+    target_mse = args.target_mse
+    keras_seconds = None
+    if target_mse is None:
+        result = run_experiment(config)
+        target_mse = result['mse']
+        keras_seconds = result['train_seconds']
+        print(f"keras  batch {config['batch_size']:>5}  {config['epochs']:>6} epochs  "
+              f"{keras_seconds:8.2f} s  MSE {target_mse:.6f}")
+
+    def report(name, models, epochs, seconds, mse):
+        reached = sum(value <= target_mse for value in mse)
+        speedup = f"  {keras_seconds * models / seconds:6.1f}x" if keras_seconds else ""
+        print(f"{name:6} batch {args.batch_size or len(x):>5}  {epochs:>6} epochs  {seconds:8.2f} s  "
+              f"MSE {min(mse):.6f}..{max(mse):.6f}  {reached}/{models} at target{speedup}")
+
+    model = NumpyMLP(layers, learning_rate=args.learning_rate, seed=args.seed)
+    epochs, seconds, mse = train_until(model, x, y, scale_y, target_mse, args.max_epochs,
+                                       args.batch_size, args.check_every)
+    report('numpy', 1, epochs, seconds, mse)
+
+    # Same epoch budget for a whole stack of seeds in one set of matmuls
+    stack = NumpyMLP(layers, models=args.models, learning_rate=args.learning_rate, seed=args.seed)
+    started = time.perf_counter()
+    stack.fit(x, y, epochs=epochs, batch_size=args.batch_size)
+    report('stack', args.models, epochs, time.perf_counter() - started, original_mse(stack, x, y, scale_y))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+
+
+def use_offscreen_platform():
+    # Run Qt without a display; takes effect for QApplications created afterwards
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values, or None when there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_event_loop(seconds):
+    # Keep the Qt event loop turning for a while, e.g. while a benchmark runs
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
@@ -0,0 +1,189 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from worker_control import WorkerControl
+
+
+class ProcessControl(WorkerControl):
+    """WorkerControl whose flags and condition are shared between processes.
+
+    Create it in the parent and pass it to the child process; pause, resume
+    and stop from either side wake the other just like between threads.
+    """
+
+    def __init__(self, context=None):
+        context = context or multiprocessing.get_context()
+        self.condition = context.Condition()
+        self.flags = context.RawArray('b', 2)  # paused, stopped
+
+    @property
+    def paused(self):
+        return bool(self.flags[0])
+
+    @paused.setter
+    def paused(self, value):
+        self.flags[0] = value
+
+    @property
+    def stopped(self):
+        return bool(self.flags[1])
+
+    @stopped.setter
+    def stopped(self, value):
+        self.flags[1] = value
+
+
+def cpu_work(iterations):
+    # Pure-Python arithmetic that holds the GIL the whole time
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def counter_process(commands, results, count_value, control, work):
+    # Long-lived: wait for a start count, count until stopped, send back the final count, repeat
+    while True:
+        count = commands.recv()
+        if count is None:
+            break
+        count_value.value = count
+        while control.sleep(0.1):
+            if work:
+                cpu_work(work)
+            count += 1
+            count_value.value = count
+        results.send(count)
+
+
+class ProcessCounters(QObject):
+    """Process-based backend for the counter demo with CounterThread1/2 semantics.
+
+    Two counter processes are started once and then take turns: stopping the
+    running one hands its final count over a pipe to the other. Progress is
+    read from shared-memory counters by a GUI timer, so no per-increment
+    messages cross the process boundary.
+    """
+
+    update_count = pyqtSignal(int, int)  # Counter (1 or 2), count
+
+    def __init__(self, poll_ms=50, work=0, parent=None):
+        super().__init__(parent)
+        # spawn works the same on every platform and never forks a running Qt app
+        context = multiprocessing.get_context('spawn')
+        self.controls = []
+        self.counts = []
+        self.commands = []
+        self.results = []
+        self.processes = []
+        for _ in range(2):
+            control = ProcessControl(context)
+            count_value = context.RawValue('q', 0)
+            command_reader, command_writer = context.Pipe(duplex=False)
+            result_reader, result_writer = context.Pipe(duplex=False)
+            process = context.Process(target=counter_process, daemon=True,
+                                      args=(command_reader, result_writer, count_value, control, work))
+            process.start()
+            self.controls.append(control)
+            self.counts.append(count_value)
+            self.commands.append(command_writer)
+            self.results.append(result_reader)
+            self.processes.append(process)
+        self.shown = [0, 0]
+        self.active = None
+        self.paused = False
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.poll_timer.start(poll_ms)
+
+    def is_busy(self):
+        return self.active is not None
+
+    def start(self, count=0, counter=0):
+        if self.active is None:
+            self.active = counter
+            self.commands[counter].send(count)
+
+    def handoff(self):
+        # Stops the running counter, poll() then starts the other one from its count
+        if self.active is not None:
+            self.controls[self.active].stop()
+
+    def pause(self):
+        self.paused = True
+        for control in self.controls:
+            control.pause()
+
+    def resume(self):
+        self.paused = False
+        for control in self.controls:
+            control.resume()
+
+    def poll(self):
+        for index, count_value in enumerate(self.counts):
+            count = count_value.value
+            if count != self.shown[index]:
+                self.shown[index] = count
+                self.update_count.emit(index + 1, count)
+        if self.active is not None and self.results[self.active].poll():
+            finished = self.active
+            count = self.results[finished].recv()
+            self.controls[finished].reset()
+            if self.paused:
+                self.controls[finished].pause()
+            self.active = None
+            self.start(count, 1 - finished)
+
+    def shutdown(self, timeout=2.0):
+        self.poll_timer.stop()
+        for control, commands in zip(self.controls, self.commands):
+            control.stop()
+            commands.send(None)
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+def measure_scaling(max_workers, iterations, chunks_per_worker=4):
+    """Throughput of cpu_work on 1..max_workers threads and processes."""
+    results = []
+    for kind, executor_class in (('threads', ThreadPoolExecutor), ('processes', ProcessPoolExecutor)):
+        single = None
+        for workers in range(1, max_workers + 1):
+            with executor_class(max_workers=workers) as executor:
+                # Warm up so process start-up is not timed
+                list(executor.map(cpu_work, [1] * workers))
+                started = time.perf_counter()
+                list(executor.map(cpu_work, [iterations] * (workers * chunks_per_worker)))
+                elapsed = time.perf_counter() - started
+            throughput = workers * chunks_per_worker * iterations / elapsed
+            single = single or throughput
+            results.append({
+                'backend': kind,
+                'workers': workers,
+                'seconds': round(elapsed, 3),
+                'iterations_per_s': round(throughput),
+                'speedup': round(throughput / single, 2),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU-bound scaling of threads vs processes")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--iterations', type=int, default=2000000, help="cpu_work iterations per chunk")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    for result in measure_scaling(args.max_workers, args.iterations):
+        print(f"{result['backend']:9} {result['workers']:>3} workers  {result['seconds']:>7.3f} s  "
+              f"{result['iterations_per_s']:>13,} it/s  speedup {result['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import asyncio
+import os
+import threading
+import serial
+from PyQt5.QtCore import QObject, pyqtSignal
+
+READ_SIZE = 65536
+FALLBACK_POLL_TIMEOUT = 0.05  # Seconds per blocking read on platforms without add_reader
+
+
+def has_selectable_fd(port):
+    try:
+        port.fileno()
+    except (AttributeError, NotImplementedError, OSError):
+        return False
+    return os.name == 'posix'
+
+
+class SerialStream:
+    """Async stream over a serial port driven by the event loop.
+
+    On POSIX the port's file descriptor is switched to non-blocking mode and
+    registered with loop.add_reader, so any number of ports can share one loop
+    without a thread each. Elsewhere (e.g. Windows COM ports) reads fall back
+    to short blocking reads in the loop's default executor.
+    """
+
+    def __init__(self, port, loop):
+        self.port = port
+        self.name = port.port
+        self.loop = loop
+        self.reader = asyncio.StreamReader(limit=READ_SIZE)
+        self.write_buffer = bytearray()
+        self.drain_waiter = None
+        self.closed = False
+        self.pump_task = None
+
+        if has_selectable_fd(port):
+            self.fd = port.fileno()
+            os.set_blocking(self.fd, False)
+            loop.add_reader(self.fd, self.on_readable)
+        else:
+            self.fd = None
+            port.timeout = FALLBACK_POLL_TIMEOUT
+            self.pump_task = loop.create_task(self.pump_blocking_reads())
+
+    def on_readable(self):
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.fail(serial.SerialException(str(e)))
+            return
+        if data:
+            self.reader.feed_data(data)
+        else:
+            self.fail(serial.SerialException("Device disconnected"))
+
+    async def pump_blocking_reads(self):
+        while not self.closed:
+            try:
+                data = await self.loop.run_in_executor(None, self.port.read, READ_SIZE)
+            except serial.SerialException as e:
+                self.fail(e)
+                return
+            if data:
+                self.reader.feed_data(data)
+
+    def fail(self, exc):
+        self.stop_reading()
+        self.reader.set_exception(exc)
+
+    def stop_reading(self):
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.loop.remove_writer(self.fd)
+        if self.pump_task is not None:
+            self.pump_task.cancel()
+
+    async def read(self, n=READ_SIZE):
+        # Returns whatever is buffered (up to n bytes), b'' once closed
+        return await self.reader.read(n)
+
+    async def readline(self):
+        return await self.reader.readline()
+
+    async def readexactly(self, n):
+        return await self.reader.readexactly(n)
+
+    def write(self, data):
+        if self.fd is None:
+            self.port.write(data)
+            return
+        if not self.write_buffer:
+            try:
+                written = os.write(self.fd, data)
+            except BlockingIOError:
+                written = 0
+            data = data[written:]
+            if not data:
+                return
+            self.loop.add_writer(self.fd, self.on_writable)
+        self.write_buffer += data
+
+    def on_writable(self):
+        try:
+            written = os.write(self.fd, self.write_buffer)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.fail(serial.SerialException(str(e)))
+            return
+        del self.write_buffer[:written]
+        if not self.write_buffer:
+            self.loop.remove_writer(self.fd)
+            if self.drain_waiter is not None and not self.drain_waiter.done():
+                self.drain_waiter.set_result(None)
+
+    async def drain(self):
+        if self.write_buffer:
+            self.drain_waiter = self.loop.create_future()
+            await self.drain_waiter
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.stop_reading()
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.cancel()
+        self.reader.feed_eof()
+        if self.port.is_open:
+            self.port.close()
+
+
+async def open_serial(port, baudrate=9600):
+    # Accepts a port name or an existing serial.Serial instance
+    if isinstance(port, str):
+        port = serial.Serial(port, baudrate, timeout=0)
+    elif not port.is_open:
+        port.open()
+    return SerialStream(port, asyncio.get_running_loop())
+
+
+class SerialEventLoop(threading.Thread):
+    """One asyncio loop in one thread serving any number of serial ports.
+
+    Received data is delivered through on_data(name, data) (or on_line(name,
+    line) in line mode) from the loop thread; errors through on_error(name,
+    message).
+    """
+
+    def __init__(self, on_data=None, on_line=None, on_error=None):
+        super().__init__(daemon=True)
+        self.on_data = on_data
+        self.on_line = on_line
+        self.on_error = on_error
+        self.loop = asyncio.new_event_loop()
+        self.streams = {}
+        self.tasks = {}
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            for stream in list(self.streams.values()):
+                stream.close()
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+
+    def open_port(self, port, baudrate=9600, line_mode=False):
+        # Thread-safe; returns a concurrent future resolving to the stream
+        return asyncio.run_coroutine_threadsafe(self.serve(port, baudrate, line_mode), self.loop)
+
+    async def serve(self, port, baudrate, line_mode):
+        name = port if isinstance(port, str) else port.port
+        try:
+            stream = await open_serial(port, baudrate)
+        except (serial.SerialException, OSError) as e:
+            self.report_error(name, f"Error opening serial port: {str(e)}")
+            return None
+        self.streams[name] = stream
+        self.tasks[name] = self.loop.create_task(self.pump(name, stream, line_mode))
+        return stream
+
+    async def pump(self, name, stream, line_mode):
+        try:
+            while True:
+                data = await (stream.readline() if line_mode else stream.read())
+                if not data:
+                    break
+                if line_mode:
+                    if self.on_line is not None:
+                        self.on_line(name, data.decode('utf-8', errors='replace').strip())
+                elif self.on_data is not None:
+                    self.on_data(name, data)
+        except (serial.SerialException, OSError, ValueError) as e:
+            self.report_error(name, f"Serial read error: {str(e)}")
+        finally:
+            stream.close()
+            self.streams.pop(name, None)
+            self.tasks.pop(name, None)
+
+    def report_error(self, name, message):
+        if self.on_error is not None:
+            self.on_error(name, message)
+
+    def write(self, name, data):
+        self.loop.call_soon_threadsafe(self.write_now, name, data)
+
+    def write_now(self, name, data):
+        stream = self.streams.get(name)
+        if stream is not None:
+            stream.write(data)
+
+    def close_port(self, name):
+        self.loop.call_soon_threadsafe(self.close_now, name)
+
+    def close_now(self, name):
+        stream = self.streams.get(name)
+        if stream is not None:
+            stream.close()
+
+    def is_open(self, name):
+        return name in self.streams
+
+    def stop(self):
+        # Queued even if run_forever() has not started yet, so an early stop is not lost
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class QtSerialBridge(QObject):
+    """Qt front end for SerialEventLoop, re-emitting its callbacks as signals."""
+
+    data_received = pyqtSignal(str, bytes)
+    line_received = pyqtSignal(str, str)
+    error_occurred = pyqtSignal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.event_loop = SerialEventLoop(
+            on_data=self.data_received.emit,
+            on_line=self.line_received.emit,
+            on_error=self.error_occurred.emit,
+        )
+        self.event_loop.start()
+
+    def open_port(self, port, baudrate=9600, line_mode=False):
+        return self.event_loop.open_port(port, baudrate, line_mode)
+
+    def close_port(self, name):
+        self.event_loop.close_port(name)
+
+    def write(self, name, data):
+        self.event_loop.write(name, data)
+
+    def is_open(self, name):
+        return self.event_loop.is_open(name)
+
+    def stop(self):
+        self.event_loop.stop()
+        self.event_loop.join()
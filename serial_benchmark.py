@@ -0,0 +1,373 @@
+import argparse
+import json
+import os
+import random
+import resource
+import socket
+import struct
+import sys
+import threading
+import time
+import serial
+
+from PyQt5.QtWidgets import QApplication
+from perf_stats import use_offscreen_platform, percentile, run_event_loop
+from serial_framing import cobs_encode
+from serial_multi import MultiPortCapture
+from worker_control import WorkerControl
+import Serial_Reader
+
+use_offscreen_platform()
+
+TIMESTAMP = struct.Struct('<Q')  # perf_counter_ns of the send, leading every framed packet
+GENERATOR_TICK = 0.001  # Seconds between generator writes
+
+
+class PtyLoopback:
+    """A pseudo-terminal pair: the generator writes the master, readers open the slave."""
+
+    def __init__(self):
+        import pty
+        import tty
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.device = os.ttyname(self.slave)
+
+    def open_port(self, baudrate):
+        return serial.Serial(self.device, baudrate, timeout=1)
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.master, view)
+            view = view[written:]
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+class SocketLoopback:
+    """socket:// stand-in for platforms without ptys."""
+
+    def __init__(self):
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.device = f"socket://127.0.0.1:{self.server.getsockname()[1]}"
+        self.connection = None
+
+    def open_port(self, baudrate):
+        port = serial.serial_for_url(self.device, baudrate=baudrate, timeout=1)
+        self.connection, _ = self.server.accept()
+        return port
+
+    def write(self, data):
+        self.connection.sendall(data)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+        self.server.close()
+
+
+def create_loopback():
+    if os.name == 'posix':
+        return PtyLoopback()
+    return SocketLoopback()
+
+
+class PatternGenerator(threading.Thread):
+    """Writes a reproducible pattern into the loopback at a fixed baud rate.
+
+    A baud rate of 0 writes as fast as the loopback accepts. Serial framing is
+    taken as 10 bits per byte (8N1).
+    """
+
+    def __init__(self, loopback, baudrate, pattern, seed=0, packet_size=64):
+        super().__init__(daemon=True)
+        self.loopback = loopback
+        self.bytes_per_second = baudrate / 10
+        self.pattern = pattern
+        self.random = random.Random(seed)
+        self.packet_size = packet_size
+        self.counter = 0
+        self.bytes_sent = 0
+        self.control = WorkerControl()
+
+    def next_chunk(self, size):
+        if self.pattern == 'counter':
+            chunk = bytes((self.counter + i) & 0xFF for i in range(size))
+            self.counter += size
+            return chunk
+        if self.pattern == 'random':
+            return self.random.randbytes(size)
+        if self.pattern == 'text':
+            line = b'sensor,%d,%d\r\n' % (self.counter, self.random.randrange(1024))
+            self.counter += 1
+            return line
+        if self.pattern == 'frames':
+            frames = bytearray()
+            while len(frames) < size:
+                payload = TIMESTAMP.pack(time.perf_counter_ns()) + self.random.randbytes(self.packet_size - TIMESTAMP.size)
+                frames += cobs_encode(payload)
+            return bytes(frames)
+        raise ValueError(f"Unknown pattern: {self.pattern}")
+
+    def run(self):
+        started = time.perf_counter()
+        while not self.control.stop_requested:
+            if self.bytes_per_second:
+                due = int((time.perf_counter() - started) * self.bytes_per_second) - self.bytes_sent
+                if due <= 0:
+                    self.control.sleep(GENERATOR_TICK)
+                    continue
+            else:
+                due = 4096
+            chunk = self.next_chunk(due)
+            try:
+                self.loopback.write(chunk)
+            except OSError:
+                break
+            self.bytes_sent += len(chunk)
+
+    def stop(self):
+        self.control.stop()
+        self.join()
+
+
+class ReceiveProbe:
+    """Slot target counting what reaches the GUI thread and how late it arrives."""
+
+    def __init__(self, timestamped=False):
+        self.timestamped = timestamped
+        self.bytes_received = 0
+        self.chunks_received = 0
+        self.frames_received = 0
+        self.latencies = []
+        self.sequence_errors = 0
+        self.expected = None
+
+    def on_data(self, data):
+        self.bytes_received += len(data)
+        self.chunks_received += 1
+
+    def on_counter_data(self, data):
+        self.on_data(data)
+        if self.expected is not None and data[0] != self.expected:
+            self.sequence_errors += 1
+        self.expected = (data[-1] + 1) & 0xFF
+
+    def on_port_data(self, name, timestamp, data):
+        # MultiPortCapture callback, called from that port's reader thread
+        self.on_counter_data(data)
+
+    def on_frames(self, frames):
+        now = time.perf_counter_ns()
+        for frame in frames:
+            self.frames_received += 1
+            self.bytes_received += len(frame)
+            if self.timestamped:
+                sent, = TIMESTAMP.unpack_from(frame)
+                self.latencies.append((now - sent) / 1e6)
+
+
+def run_scenario(name, target, baudrate, pattern, framing, duration, seed):
+    loopback = create_loopback()
+    probe = ReceiveProbe(timestamped=pattern == 'frames')
+    monitor = None
+
+    if target == 'monitor':
+        monitor = Serial_Reader.SerialMonitor()
+        monitor.port_combo.addItem(loopback.device)
+        monitor.port_combo.setCurrentText(loopback.device)
+        monitor.baud_combo.setCurrentText(str(baudrate or 921600))
+        monitor.framing_combo.setCurrentText(framing or "Raw")
+        monitor.start_monitoring()
+        thread = monitor.serial_thread
+    else:
+        framer = Serial_Reader.create_framer(framing) if framing else None
+        thread = Serial_Reader.SerialThread(loopback.open_port(baudrate or 921600), framer)
+
+    if pattern == 'counter':
+        thread.data_received.connect(probe.on_counter_data)
+    else:
+        thread.data_received.connect(probe.on_data)
+    thread.frames_received.connect(probe.on_frames)
+    if target != 'monitor':
+        thread.start()
+
+    generator = PatternGenerator(loopback, baudrate, pattern, seed)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    generator.start()
+    run_event_loop(duration)
+    generator.stop()
+    run_event_loop(0.2)  # Let the reader drain what is already in flight
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if monitor is not None:
+        monitor.stop_monitoring()
+        monitor.deleteLater()
+    else:
+        thread.stop()
+        thread.serial_port.close()
+    loopback.close()
+
+    return {
+        'scenario': name,
+        'target': target,
+        'baudrate': baudrate,
+        'pattern': pattern,
+        'framing': framing,
+        'seconds': round(wall, 3),
+        'bytes_sent': generator.bytes_sent,
+        'bytes_received': probe.bytes_received,
+        'throughput_bps': round(probe.bytes_received / wall, 1),
+        'chunks': probe.chunks_received,
+        'frames': probe.frames_received,
+        'sequence_errors': probe.sequence_errors,
+        'latency_ms_p50': percentile(probe.latencies, 0.50),
+        'latency_ms_p95': percentile(probe.latencies, 0.95),
+        'latency_ms_p99': percentile(probe.latencies, 0.99),
+        'cpu_percent': round(100 * cpu / wall, 1),
+        'max_rss_kb': rss_after,
+        'rss_growth_kb': rss_after - rss_before,
+    }
+
+
+def run_multi_scenario(name, mode, ports, baudrate, pattern, duration, seed):
+    # Every port gets its own loopback and generator, all read by one MultiPortCapture
+    loopbacks = [create_loopback() for _ in range(ports)]
+    probes = {loopback.device: ReceiveProbe() for loopback in loopbacks}
+    capture = MultiPortCapture(mode, on_data=lambda port, timestamp, data: probes[port].on_port_data(port, timestamp, data))
+    for loopback in loopbacks:
+        capture.add_port(loopback.device, port=loopback.open_port(baudrate or 921600))
+    capture.start()
+
+    generators = [PatternGenerator(loopback, baudrate, pattern, seed + index) for index, loopback in enumerate(loopbacks)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    for generator in generators:
+        generator.start()
+    run_event_loop(duration)
+    for generator in generators:
+        generator.stop()
+    run_event_loop(0.2)
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    capture.stop()
+    for loopback in loopbacks:
+        loopback.close()
+
+    bytes_received = sum(probe.bytes_received for probe in probes.values())
+    return {
+        'scenario': name,
+        'target': f"multi_{mode}",
+        'ports': ports,
+        'baudrate': baudrate,
+        'pattern': pattern,
+        'framing': None,
+        'seconds': round(wall, 3),
+        'bytes_sent': sum(generator.bytes_sent for generator in generators),
+        'bytes_received': bytes_received,
+        'throughput_bps': round(bytes_received / wall, 1),
+        'min_port_bps': round(min(probe.bytes_received for probe in probes.values()) / wall, 1),
+        'chunks': sum(probe.chunks_received for probe in probes.values()),
+        'frames': 0,
+        'sequence_errors': sum(probe.sequence_errors for probe in probes.values()),
+        'latency_ms_p50': None,
+        'latency_ms_p95': None,
+        'latency_ms_p99': None,
+        'cpu_percent': round(100 * cpu / wall, 1),
+        'max_rss_kb': rss_after,
+        'rss_growth_kb': rss_after - rss_before,
+    }
+
+
+# name -> (target, baudrate, pattern, framing); baudrate 0 means unthrottled
+SCENARIOS = {
+    'thread_raw_115200': ('thread', 115200, 'counter', None),
+    'thread_raw_921600': ('thread', 921600, 'counter', None),
+    'thread_raw_unthrottled': ('thread', 0, 'random', None),
+    'thread_cobs_921600': ('thread', 921600, 'frames', 'COBS'),
+    'thread_lines_115200': ('thread', 115200, 'text', 'Line (CRLF)'),
+    'monitor_raw_115200': ('monitor', 115200, 'text', None),
+    'monitor_cobs_115200': ('monitor', 115200, 'frames', 'COBS'),
+}
+
+# name -> (MultiPortCapture mode, ports, baudrate, pattern); 1 vs 4 ports shows how each mode scales
+MULTI_SCENARIOS = {
+    f"multi_{mode}_{ports}x921600": (mode, ports, 921600, 'counter')
+    for mode in MultiPortCapture.MODES for ports in (1, 4)
+}
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    regressions = []
+    previous = {result['scenario']: result for result in baseline}
+    for result in results:
+        old = previous.get(result['scenario'])
+        if old is None:
+            continue
+        if result['throughput_bps'] < old['throughput_bps'] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: throughput {old['throughput_bps']} -> {result['throughput_bps']} B/s")
+        if result['latency_ms_p99'] is not None and old.get('latency_ms_p99') is not None:
+            # 1 ms of slack so timer noise on idle scenarios does not count
+            if result['latency_ms_p99'] > old['latency_ms_p99'] * (1 + tolerance) + 1.0:
+                regressions.append(f"{result['scenario']}: p99 latency {old['latency_ms_p99']:.2f} -> {result['latency_ms_p99']:.2f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback throughput benchmark for Serial_Reader.py")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS) + sorted(MULTI_SCENARIOS),
+                        help="Scenario to run (default: all)")
+    parser.add_argument('--duration', type=float, default=3.0, help="Seconds per scenario")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write results as JSON")
+    parser.add_argument('--baseline', help="Results JSON from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    results = []
+    for name in args.scenario or list(SCENARIOS) + list(MULTI_SCENARIOS):
+        if name in MULTI_SCENARIOS:
+            mode, ports, baudrate, pattern = MULTI_SCENARIOS[name]
+            result = run_multi_scenario(name, mode, ports, baudrate, pattern, args.duration, args.seed)
+        else:
+            target, baudrate, pattern, framing = SCENARIOS[name]
+            result = run_scenario(name, target, baudrate, pattern, framing, args.duration, args.seed)
+        results.append(result)
+        latency = f"{result['latency_ms_p50']:.2f}/{result['latency_ms_p99']:.2f} ms" if result['latency_ms_p50'] is not None else "-"
+        print(f"{name:24} {result['throughput_bps']:>12.0f} B/s  p50/p99 {latency:>16}  "
+              f"cpu {result['cpu_percent']:>5}%  rss {result['max_rss_kb']} kB  seq errors {result['sequence_errors']}")
+    app.processEvents()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+
+# Capture file layout: an 8 byte magic followed by records of
+# [float64 timestamp][uint32 payload length][payload bytes], little endian.
+CAPTURE_MAGIC = b'SCAP0001'
+RECORD_HEADER = struct.Struct('<dI')
+
+
+def format_binary(data):
+    return ' '.join(f'{byte:08b}' for byte in data)
+
+
+def format_hex(data):
+    return ' '.join(f'{byte:02X}' for byte in data)
+
+
+def format_char(data):
+    return bytes(data).decode('utf-8', errors='replace')
+
+
+EXPORT_FORMATS = {
+    'binary': format_binary,
+    'hex': format_hex,
+    'char': format_char,
+}
+
+
+class CaptureWriter(threading.Thread):
+    """Background thread that streams timestamped chunks to a capture file."""
+
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.queue = queue.Queue()
+        self.bytes_written = 0
+        self.records_written = 0
+
+    def write(self, data, timestamp=None):
+        # Called from the reader thread, so only enqueue here
+        if timestamp is None:
+            timestamp = time.time()
+        self.queue.put((timestamp, bytes(data)))
+
+    def run(self):
+        with open(self.path, 'wb') as capture_file:
+            capture_file.write(CAPTURE_MAGIC)
+            running = True
+            while running:
+                item = self.queue.get()
+                # Drain everything that is already queued before flushing
+                while True:
+                    if item is None:
+                        running = False
+                        break
+                    timestamp, data = item
+                    capture_file.write(RECORD_HEADER.pack(timestamp, len(data)))
+                    capture_file.write(data)
+                    self.bytes_written += len(data)
+                    self.records_written += 1
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                # Flush per batch so a crash loses at most the last batch
+                capture_file.flush()
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+
+class CaptureReader:
+    """Memory-mapped, random access view over an existing capture file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        if size < len(CAPTURE_MAGIC):
+            self.file.close()
+            raise ValueError(f"{path} is not a capture file")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a capture file")
+        self.offsets = []
+        self.index_records()
+
+    def index_records(self):
+        # A truncated trailing record (e.g. after a crash) is ignored
+        offset = len(CAPTURE_MAGIC)
+        size = len(self.map)
+        while offset + RECORD_HEADER.size <= size:
+            _, length = RECORD_HEADER.unpack_from(self.map, offset)
+            end = offset + RECORD_HEADER.size + length
+            if end > size:
+                break
+            self.offsets.append(offset)
+            offset = end
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        timestamp, length = RECORD_HEADER.unpack_from(self.map, offset)
+        start = offset + RECORD_HEADER.size
+        return timestamp, memoryview(self.map)[start:start + length]
+
+    def __iter__(self):
+        for index in range(len(self.offsets)):
+            yield self[index]
+
+    def export(self, path, fmt):
+        formatter = EXPORT_FORMATS[fmt]
+        with open(path, 'w') as export_file:
+            for index, (_, data) in enumerate(self):
+                if index:
+                    export_file.write('\n')
+                export_file.write(formatter(data))
+                data.release()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
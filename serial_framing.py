@@ -0,0 +1,219 @@
+import binascii
+import struct
+import zlib
+
+# Optional trailing checksums: name -> (size in bytes, function returning the packed checksum).
+# Both are sent big-endian.
+CHECKSUMS = {
+    'crc16': (2, lambda payload: struct.pack('>H', binascii.crc_hqx(payload, 0xFFFF))),  # CRC-16/CCITT-FALSE
+    'crc32': (4, lambda payload: struct.pack('>I', zlib.crc32(payload))),
+}
+
+SLIP_END = 0xC0
+SLIP_ESC = 0xDB
+SLIP_ESC_END = 0xDC
+SLIP_ESC_ESC = 0xDD
+
+
+def append_checksum(payload, crc):
+    if crc is None:
+        return bytes(payload)
+    _, checksum = CHECKSUMS[crc]
+    return bytes(payload) + checksum(payload)
+
+
+def cobs_encode(payload):
+    encoded = bytearray()
+    for block in bytes(payload).split(b'\x00'):
+        # Blocks longer than 254 bytes are split without an implied zero
+        while len(block) >= 254:
+            encoded.append(255)
+            encoded += block[:254]
+            block = block[254:]
+        encoded.append(len(block) + 1)
+        encoded += block
+    return bytes(encoded) + b'\x00'
+
+
+def cobs_decode(encoded):
+    decoded = bytearray()
+    index = 0
+    while index < len(encoded):
+        code = encoded[index]
+        if code == 0 or index + code > len(encoded):
+            raise ValueError("Invalid COBS frame")
+        decoded += encoded[index + 1:index + code]
+        index += code
+        if code < 255 and index < len(encoded):
+            decoded.append(0)
+    return bytes(decoded)
+
+
+def slip_encode(payload):
+    encoded = bytearray([SLIP_END])
+    for byte in bytes(payload):
+        if byte == SLIP_END:
+            encoded += bytes([SLIP_ESC, SLIP_ESC_END])
+        elif byte == SLIP_ESC:
+            encoded += bytes([SLIP_ESC, SLIP_ESC_ESC])
+        else:
+            encoded.append(byte)
+    encoded.append(SLIP_END)
+    return bytes(encoded)
+
+
+def slip_decode(encoded):
+    decoded = bytearray()
+    escaped = False
+    for byte in encoded:
+        if escaped:
+            if byte == SLIP_ESC_END:
+                decoded.append(SLIP_END)
+            elif byte == SLIP_ESC_ESC:
+                decoded.append(SLIP_ESC)
+            else:
+                raise ValueError("Invalid SLIP escape")
+            escaped = False
+        elif byte == SLIP_ESC:
+            escaped = True
+        else:
+            decoded.append(byte)
+    if escaped:
+        raise ValueError("Truncated SLIP escape")
+    return bytes(decoded)
+
+
+class Framer:
+    """Base class that turns arbitrary read chunks into whole frames.
+
+    Incoming bytes are appended to one reusable buffer and subclasses scan it
+    through a memoryview, so frame boundaries never force extra copies of the
+    stream. The consumed prefix is dropped once per feed() call.
+    """
+
+    def __init__(self, crc=None, max_frame_size=65536):
+        if crc is not None and crc not in CHECKSUMS:
+            raise ValueError(f"Unknown checksum: {crc}")
+        self.crc = crc
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray()
+        self.frame_count = 0
+        self.checksum_errors = 0
+        self.framing_errors = 0
+
+    def feed(self, data):
+        self.buffer += data
+        frames = []
+        view = memoryview(self.buffer)
+        try:
+            consumed = self.extract(view, frames)
+        finally:
+            view.release()
+        if consumed:
+            del self.buffer[:consumed]
+        if len(self.buffer) > self.max_frame_size:
+            # No boundary in sight, drop the garbage instead of growing forever
+            self.framing_errors += 1
+            self.buffer.clear()
+        return frames
+
+    def extract(self, view, frames):
+        raise NotImplementedError
+
+    def emit(self, frame, frames):
+        if self.crc is not None:
+            size, checksum = CHECKSUMS[self.crc]
+            payload = frame[:-size]
+            if len(frame) < size or checksum(payload) != bytes(frame[-size:]):
+                self.checksum_errors += 1
+                return
+            frame = payload
+        self.frame_count += 1
+        frames.append(bytes(frame))
+
+    def reset(self):
+        self.buffer.clear()
+
+
+class DelimiterFramer(Framer):
+    def __init__(self, delimiter=b'\r\n', **kwargs):
+        super().__init__(**kwargs)
+        self.delimiter = delimiter
+
+    def extract(self, view, frames):
+        start = 0
+        while True:
+            end = self.buffer.find(self.delimiter, start)
+            if end < 0:
+                return start
+            self.emit(view[start:end], frames)
+            start = end + len(self.delimiter)
+
+
+class LengthPrefixFramer(Framer):
+    HEADER_FORMATS = {1: '>B', 2: '>H', 4: '>I'}
+
+    def __init__(self, header_size=2, **kwargs):
+        super().__init__(**kwargs)
+        self.header = struct.Struct(self.HEADER_FORMATS[header_size])
+
+    def extract(self, view, frames):
+        start = 0
+        while start + self.header.size <= len(view):
+            length, = self.header.unpack_from(view, start)
+            if length > self.max_frame_size:
+                # Corrupt length, resynchronise on the next byte
+                self.framing_errors += 1
+                start += 1
+                continue
+            end = start + self.header.size + length
+            if end > len(view):
+                break
+            self.emit(view[start + self.header.size:end], frames)
+            start = end
+        return start
+
+
+class CobsFramer(Framer):
+    def extract(self, view, frames):
+        start = 0
+        while True:
+            end = self.buffer.find(b'\x00', start)
+            if end < 0:
+                return start
+            if end > start:
+                try:
+                    self.emit(cobs_decode(view[start:end]), frames)
+                except ValueError:
+                    self.framing_errors += 1
+            start = end + 1
+
+
+class SlipFramer(Framer):
+    def extract(self, view, frames):
+        start = 0
+        while True:
+            end = self.buffer.find(SLIP_END, start)
+            if end < 0:
+                return start
+            # Back-to-back END bytes delimit empty frames, which are skipped
+            if end > start:
+                try:
+                    self.emit(slip_decode(view[start:end]), frames)
+                except ValueError:
+                    self.framing_errors += 1
+            start = end + 1
+
+
+FRAMERS = {
+    'Line (CRLF)': DelimiterFramer,
+    'Length-prefixed': LengthPrefixFramer,
+    'COBS': CobsFramer,
+    'SLIP': SlipFramer,
+}
+
+
+def create_framer(name, crc=None):
+    if name not in FRAMERS:
+        return None
+    return FRAMERS[name](crc=crc)
@@ -0,0 +1,178 @@
+import heapq
+import selectors
+import threading
+import time
+import serial
+from serial_async import SerialEventLoop
+from worker_control import WorkerControl
+
+
+class PortStats:
+    def __init__(self, name):
+        self.name = name
+        self.bytes_received = 0
+        self.chunks_received = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.last_data = None
+
+    def record(self, data):
+        self.bytes_received += len(data)
+        self.chunks_received += 1
+        self.last_data = time.monotonic()
+
+    def throughput(self):
+        elapsed = time.monotonic() - self.started
+        return self.bytes_received / elapsed if elapsed > 0 else 0.0
+
+
+class CaptureStore:
+    """Timestamp-ordered store for chunks coming from several ports.
+
+    Each port only ever appends to its own list, which is already in time
+    order, so readers never contend with each other. The merged view is built
+    lazily with a k-way merge.
+    """
+
+    def __init__(self):
+        self.streams = {}
+
+    def add_port(self, name):
+        self.streams[name] = []
+
+    def append(self, name, timestamp, data):
+        self.streams[name].append((timestamp, name, data))
+
+    def merged(self):
+        return heapq.merge(*self.streams.values(), key=lambda record: record[0])
+
+    def __len__(self):
+        return sum(len(stream) for stream in self.streams.values())
+
+    def clear(self):
+        for stream in self.streams.values():
+            stream.clear()
+
+
+class PortReaderThread(threading.Thread):
+    """One blocking reader per port; a slow device only ever blocks itself."""
+
+    def __init__(self, capture, name, port):
+        super().__init__(daemon=True)
+        self.capture = capture
+        self.name = name
+        self.port = port
+        self.control = WorkerControl()
+
+    def run(self):
+        while not self.control.stop_requested:
+            try:
+                # Blocks in the driver until data or the port timeout, no busy wait
+                data = self.port.read(max(1, self.port.in_waiting))
+            except serial.SerialException:
+                self.capture.stats[self.name].errors += 1
+                break
+            if data:
+                self.capture.dispatch(self.name, data)
+
+    def stop(self):
+        self.control.stop()
+
+
+class SelectorReaderThread(threading.Thread):
+    """A single I/O thread that multiplexes every port with a selector."""
+
+    def __init__(self, capture, ports):
+        super().__init__(daemon=True)
+        self.capture = capture
+        self.selector = selectors.DefaultSelector()
+        for name, port in ports.items():
+            self.selector.register(port.fileno(), selectors.EVENT_READ, (name, port))
+        self.control = WorkerControl()
+
+    def run(self):
+        while not self.control.stop_requested:
+            for key, _ in self.selector.select(timeout=0.1):
+                name, port = key.data
+                try:
+                    # Ports are non-blocking here, so a read only returns what is ready
+                    data = port.read(max(1, port.in_waiting))
+                except serial.SerialException:
+                    self.capture.stats[name].errors += 1
+                    self.selector.unregister(key.fileobj)
+                    continue
+                if data:
+                    self.capture.dispatch(name, data)
+        self.selector.close()
+
+    def stop(self):
+        self.control.stop()
+
+
+class MultiPortCapture:
+    """Opens several serial ports and merges their streams into one store."""
+
+    MODES = ('threads', 'selector', 'asyncio')
+
+    def __init__(self, mode='threads', on_data=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown capture mode: {mode}")
+        self.mode = mode
+        self.on_data = on_data
+        self.ports = {}
+        self.stats = {}
+        self.store = CaptureStore()
+        self.readers = []
+
+    def add_port(self, name, baudrate=9600, port=None):
+        if port is None:
+            port = serial.Serial()
+            port.port = name
+            port.baudrate = baudrate
+        # Selector and asyncio modes need non-blocking ports, thread mode a short blocking read
+        port.timeout = 0.1 if self.mode == 'threads' else 0
+        self.ports[name] = port
+        self.stats[name] = PortStats(name)
+        self.store.add_port(name)
+
+    def dispatch(self, name, data):
+        timestamp = time.time()
+        self.stats[name].record(data)
+        self.store.append(name, timestamp, data)
+        if self.on_data is not None:
+            self.on_data(name, timestamp, data)
+
+    def report_error(self, name, message):
+        self.stats[name].errors += 1
+
+    def start(self):
+        for name, port in self.ports.items():
+            if not port.is_open:
+                port.open()
+            self.stats[name].started = time.monotonic()
+
+        if self.mode == 'selector':
+            self.readers = [SelectorReaderThread(self, self.ports)]
+        elif self.mode == 'asyncio':
+            self.readers = [SerialEventLoop(on_data=self.dispatch, on_error=self.report_error)]
+        else:
+            self.readers = [PortReaderThread(self, name, port) for name, port in self.ports.items()]
+        for reader in self.readers:
+            reader.start()
+        if self.mode == 'asyncio':
+            # Every port shares the one event loop, no thread per port
+            for port in self.ports.values():
+                self.readers[0].open_port(port)
+
+    def stop(self):
+        for reader in self.readers:
+            reader.stop()
+        for reader in self.readers:
+            reader.join()
+        self.readers = []
+        for port in self.ports.values():
+            if port.is_open:
+                port.close()
+
+    def total_throughput(self):
+        return sum(stats.throughput() for stats in self.stats.values())
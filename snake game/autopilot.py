@@ -0,0 +1,292 @@
+import argparse
+import os
+import sys
+import time
+import logging
+
+if __name__ == "__main__":
+    # Run as the soak test script rather than through snake_engine, which sets this up otherwise
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from snake_core import SnakeState, OBSTACLE_RATIO
+from input_sources import InputSource
+from replay import Replay
+from perf_stats import percentile
+
+NEVER = -2 ** 62  # "Entered" tick of cells the snake has never covered
+
+
+class Autopilot:
+    """Plans snake moves with breadth-first search over the grid.
+
+    Cells are flat indices (y * cols + x) with a precomputed neighbour table.
+    For every cell the tick at which the head entered it is kept, which tells
+    how many moves it takes before a body cell is vacated by the tail, so the
+    search can route through body cells that will be free by the time the head
+    gets there. It is synced in O(1) per tick from the state's new head.
+
+    A path to the food is taken only if the tail is still reachable after
+    eating; otherwise the snake follows its tail the long way round. A path to
+    the food stays valid while it is followed, so a full search only runs when
+    new food appears or while the snake is tail-following.
+    """
+
+    def __init__(self, patience=None):
+        # Ticks without eating before an unsafe path to the food is taken anyway,
+        # so a snake that can only end in a dead end does not circle forever
+        self.patience = patience
+        self.state = None
+
+    def setup(self, state):
+        self.state = state
+        self.cols = cols = state.cols
+        size = cols * state.rows
+        self.blocked = bytearray(size)
+        for x, y in state.obstacle_cells:
+            self.blocked[y * cols + x] = 1
+        self.neighbours = []
+        for index in range(size):
+            x, y = index % cols, index // cols
+            cells = []
+            if x > 0:
+                cells.append(index - 1)
+            if x < cols - 1:
+                cells.append(index + 1)
+            if y > 0:
+                cells.append(index - cols)
+            if y < state.rows - 1:
+                cells.append(index + cols)
+            self.neighbours.append(tuple(cells))
+        self.moves = {-1: 'LEFT', 1: 'RIGHT', -cols: 'UP', cols: 'DOWN'}
+        self.hunger_limit = self.patience if self.patience is not None else 2 * size
+        self.resync()
+
+    def resync(self):
+        state = self.state
+        self.entered = [NEVER] * (state.cols * state.rows)
+        for offset, (x, y) in enumerate(state.body):
+            self.entered[y * self.cols + x] = state.ticks - offset
+        self.synced = state.ticks
+        self.plan = []
+        self.plan_food = None
+        self.retry_tick = 0
+        self.length = len(state.body)
+        self.fed_tick = state.ticks
+
+    def sync(self, state):
+        if state is not self.state:
+            self.setup(state)
+        elif state.ticks == self.synced + 1:
+            x, y = state.head
+            self.entered[y * self.cols + x] = state.ticks
+            self.synced = state.ticks
+        elif state.ticks != self.synced:
+            self.resync()
+
+    def cell(self, position):
+        return position[1] * self.cols + position[0]
+
+    def search(self, start, target, ticks, length):
+        # Level-order BFS; a body cell can be entered once the tail has moved off it
+        base = ticks - length + 1
+        entered = self.entered
+        blocked = self.blocked
+        neighbours = self.neighbours
+        parent = {start: -1}
+        frontier = [start]
+        depth = 0
+        while frontier:
+            depth += 1
+            following = []
+            for cell in frontier:
+                for step in neighbours[cell]:
+                    if step in parent or blocked[step] or entered[step] - base >= depth:
+                        continue
+                    parent[step] = cell
+                    if step == target:
+                        path = [step]
+                        while parent[path[-1]] != start:
+                            path.append(parent[path[-1]])
+                        path.reverse()
+                        return path
+                    following.append(step)
+            frontier = following
+        return None
+
+    def path_to_tail_after(self, path, grow):
+        # Pretend to walk the path, then search from the new head to the new tail
+        state = self.state
+        ticks = state.ticks
+        length = len(state.body) + grow
+        saved = [(cell, self.entered[cell]) for cell in path]
+        for offset, cell in enumerate(path, 1):
+            self.entered[cell] = ticks + offset
+        to_tail = self.search(path[-1], self.tail_cell(path, length), ticks + len(path), length)
+        for cell, value in reversed(saved):
+            self.entered[cell] = value
+        return to_tail
+
+    def tail_cell(self, path, length):
+        if len(path) >= length:
+            return path[len(path) - length]
+        return self.cell(self.state.body[length - len(path) - 1])
+
+    def flood_area(self, start, ticks, length):
+        base = ticks - length + 1
+        seen = {start}
+        frontier = [start]
+        depth = 0
+        while frontier:
+            depth += 1
+            following = []
+            for cell in frontier:
+                for step in self.neighbours[cell]:
+                    if step not in seen and not self.blocked[step] and self.entered[step] - base < depth:
+                        seen.add(step)
+                        following.append(step)
+            frontier = following
+        return len(seen)
+
+    def next_direction(self, state):
+        self.sync(state)
+        head = self.cell(state.head)
+        food = self.cell(state.food) if state.food is not None else None
+
+        if len(state.body) != self.length:
+            self.length = len(state.body)
+            self.fed_tick = state.ticks
+        starving = state.ticks - self.fed_tick > self.hunger_limit
+
+        base = state.ticks - len(state.body) + 1
+        if (self.plan and self.plan_food == food and self.plan[0] in self.neighbours[head]
+                and self.entered[self.plan[0]] - base < 1):
+            return self.moves[self.plan.pop(0) - head]
+
+        self.plan = []
+        if food is not None and state.ticks >= self.retry_tick:
+            path = self.search(head, food, state.ticks, len(state.body))
+            if path is not None and (starving or self.path_to_tail_after(path, 1) is not None):
+                self.plan = path
+                self.plan_food = food
+                return self.moves[self.plan.pop(0) - head]
+            # The food is unreachable or unsafe for now, try again after a few moves
+            self.retry_tick = state.ticks + 1 + (len(path) if path else len(state.body)) // 4
+
+        return self.follow_tail(state, head, food)
+
+    def follow_tail(self, state, head, food):
+        length = len(state.body)
+        base = state.ticks - length + 1
+        best = None
+        best_distance = -1
+        for step in self.neighbours[head]:
+            if self.blocked[step] or self.entered[step] - base >= 1:
+                continue
+            to_tail = self.path_to_tail_after([step], int(step == food))
+            # Prefer the move that keeps the tail furthest away, it leaves the most room
+            if to_tail is not None and len(to_tail) > best_distance:
+                best, best_distance = step, len(to_tail)
+        if best is None:
+            # Trapped: move into the largest open region and hope it clears
+            best_area = -1
+            for step in self.neighbours[head]:
+                if self.blocked[step] or self.entered[step] - base >= 1:
+                    continue
+                area = self.flood_area(step, state.ticks + 1, length)
+                if area > best_area:
+                    best, best_area = step, area
+        if best is None:
+            return None
+        return self.moves[best - head]
+
+
+class AutopilotInput(InputSource):
+    """Lets the Autopilot steer the game; I toggles it on and off."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.autopilot = Autopilot()
+        self.plan_times = []
+
+    def key_pressed(self, key):
+        if key != Qt.Key_I:
+            return False
+        self.enabled = not self.enabled
+        return True
+
+    def reset(self):
+        super().reset()
+        self.plan_times = []
+
+    def before_tick(self, state):
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        direction = self.autopilot.next_direction(state)
+        self.plan_times.append(1000 * (time.perf_counter() - started))
+        return direction
+
+    def refresh_stats(self, clock):
+        if self.plan_times:
+            # Planning has to fit comfortably inside one tick
+            logging.debug(f"Autopilot plan p50 {percentile(self.plan_times, 0.50):.2f} ms  "
+                          f"p99 {percentile(self.plan_times, 0.99):.2f} ms "
+                          f"(tick {1000 * clock.period:.0f} ms)")
+            self.plan_times = []
+
+
+def soak(games, cols, rows, seed, obstacle_ratio, max_ticks, replay_dir=None):
+    """Play autopilot games headlessly; returns the finished states and per-tick plan times."""
+    states = []
+    plan_times = []
+    for game in range(games):
+        state = SnakeState(cols, rows, seed=None if seed is None else seed + game, obstacle_ratio=obstacle_ratio)
+        replay = Replay.for_state(state)
+        autopilot = Autopilot()
+        while state.ticks < max_ticks:
+            started = time.perf_counter()
+            direction = autopilot.next_direction(state)
+            plan_times.append(time.perf_counter() - started)
+            if direction is not None:
+                state.turn(direction)
+            alive = state.step()
+            replay.record(state)
+            if not alive:
+                break
+        if replay_dir:
+            replay.save(os.path.join(replay_dir, f"autopilot_{state.seed}.snkr"))
+        states.append(state)
+    return states, plan_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless autopilot soak test for the snake engine")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--cols', type=int, default=96)
+    parser.add_argument('--rows', type=int, default=54)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--obstacles', type=float, default=OBSTACLE_RATIO)
+    parser.add_argument('--max-ticks', type=int, default=200000)
+    parser.add_argument('--save-replays', metavar='DIR', help="Write every game as a .snkr replay into DIR")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    states, plan_times = soak(args.games, args.cols, args.rows, args.seed, args.obstacles,
+                              args.max_ticks, args.save_replays)
+    elapsed = time.perf_counter() - started
+
+    ticks = sum(state.ticks for state in states)
+    scores = sorted(state.score for state in states)
+    plan_ms = [1000 * value for value in plan_times]
+    print(f"{len(states)} games on {args.cols}x{args.rows}, {ticks} ticks in {elapsed:.2f} s "
+          f"({ticks / elapsed if elapsed else 0:,.0f} ticks/s)")
+    print(f"Score min {scores[0]}  median {scores[len(scores) // 2]}  max {scores[-1]}  "
+          f"boards filled {sum(state.won for state in states)}  "
+          f"timed out {sum(state.alive for state in states)}")
+    print(f"Plan time p50 {percentile(plan_ms, 0.50):.3f} ms  p99 {percentile(plan_ms, 0.99):.3f} ms  "
+          f"max {max(plan_ms):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from PyQt5.QtCore import QRect, QSize
+from PyQt5.QtGui import QPainter, QPixmap, QColor
+
+SNAKE_COLOR = QColor(0, 255, 0)
+FOOD_COLOR = QColor(255, 0, 0)
+OBSTACLE_COLOR = QColor(0, 0, 255)
+
+
+class BoardGeometry:
+    """Cached transform from grid cells to pixels inside a board area.
+
+    The cell size is the largest whole number of pixels that fits cols x rows
+    into the area, and the board is centred in it. Pixel offsets of every
+    column and row are precomputed, so mapping a cell is two list lookups.
+    Build a new one only when the area or the grid changes, i.e. on resize.
+    """
+
+    def __init__(self, area, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = max(1, min(area.width() // cols, area.height() // rows))
+        left = area.left() + (area.width() - cols * self.cell_size) // 2
+        top = area.top() + (area.height() - rows * self.cell_size) // 2
+        self.xs = [left + x * self.cell_size for x in range(cols)]
+        self.ys = [top + y * self.cell_size for y in range(rows)]
+        self.board_rect = QRect(left, top, cols * self.cell_size, rows * self.cell_size)
+
+    def cell_rect(self, cell):
+        x, y = cell
+        return QRect(self.xs[x], self.ys[y], self.cell_size, self.cell_size)
+
+
+def grid_for_area(area, cell_size):
+    # Columns and rows of cell_size pixels that fit in the area
+    return max(1, area.width() // cell_size), max(1, area.height() // cell_size)
+
+
+def device_rect(rect, ratio):
+    # Pixmap source rects are in device pixels on high-DPI screens
+    if ratio == 1:
+        return rect
+    return QRect(round(rect.x() * ratio), round(rect.y() * ratio),
+                 round(rect.width() * ratio), round(rect.height() * ratio))
+
+
+class BoardRenderer:
+    """Incrementally maintained picture of the board.
+
+    Obstacles never move, so they are drawn once into a background pixmap.
+    The board pixmap starts as a copy of it and after every tick only the
+    cells that changed (new head, vacated tail, new food) are redrawn. The
+    caller invalidates just the returned rects, so the cost of a tick does not
+    depend on the snake length or the board size.
+    """
+
+    def __init__(self):
+        self.geometry = None
+        self.pixel_ratio = 1.0
+        self.background = None
+        self.board = None
+        self.food = None
+
+    def cell_rect(self, cell):
+        return self.geometry.cell_rect(cell)
+
+    def fill_cell(self, painter, cell, color):
+        # Outline stays inside the cell so neighbouring cells can be redrawn independently
+        painter.setBrush(color)
+        size = self.geometry.cell_size
+        painter.drawRect(self.geometry.xs[cell[0]], self.geometry.ys[cell[1]], size - 1, size - 1)
+
+    def new_pixmap(self, size):
+        # Backed by device pixels so the board stays sharp on scaled 4K screens
+        pixmap = QPixmap(QSize(round(size.width() * self.pixel_ratio), round(size.height() * self.pixel_ratio)))
+        pixmap.setDevicePixelRatio(self.pixel_ratio)
+        return pixmap
+
+    def reset(self, state, geometry, size, background_color, pixel_ratio=1.0):
+        self.geometry = geometry
+        self.pixel_ratio = pixel_ratio
+        self.background = self.new_pixmap(size)
+        self.background.fill(background_color)
+        painter = QPainter(self.background)
+        for cell in state.obstacles:
+            self.fill_cell(painter, cell, OBSTACLE_COLOR)
+        painter.end()
+
+        self.board = QPixmap(self.background)
+        painter = QPainter(self.board)
+        for cell in state.body:
+            self.fill_cell(painter, cell, SNAKE_COLOR)
+        if state.food:
+            self.fill_cell(painter, state.food, FOOD_COLOR)
+        painter.end()
+        self.food = state.food
+
+    def update(self, state):
+        # Redraw the cells changed by the last step and return their rects
+        dirty = []
+        painter = QPainter(self.board)
+        if state.vacated is not None:
+            rect = self.cell_rect(state.vacated)
+            painter.drawPixmap(rect, self.background, device_rect(rect, self.pixel_ratio))
+            dirty.append(rect)
+        if state.alive or state.won:
+            self.fill_cell(painter, state.head, SNAKE_COLOR)
+            dirty.append(self.cell_rect(state.head))
+        if state.food != self.food:
+            if state.food:
+                self.fill_cell(painter, state.food, FOOD_COLOR)
+                dirty.append(self.cell_rect(state.food))
+            self.food = state.food
+        painter.end()
+        return dirty
+
+    def paint(self, painter, rect):
+        if self.board is not None:
+            painter.drawPixmap(rect, self.board, device_rect(rect, self.pixel_ratio))
@@ -0,0 +1,46 @@
+import random
+
+
+class FreeCellIndex:
+    """Set of empty board cells with O(1) add, remove and uniform sampling.
+
+    Cells live in a dense list and a dict maps each cell to its slot, so a
+    removal swaps the last cell into the hole instead of shifting the list.
+    """
+
+    def __init__(self, cells=(), rng=None):
+        self.rng = rng or random.Random()
+        self.cells = list(cells)
+        self.positions = {cell: index for index, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+    def add(self, cell):
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        index = self.positions.pop(cell, None)
+        if index is None:
+            return
+        last = self.cells.pop()
+        if index < len(self.cells):
+            self.cells[index] = last
+            self.positions[last] = index
+
+    def sample(self):
+        # None means the board is full
+        if not self.cells:
+            return None
+        return self.cells[self.rng.randrange(len(self.cells))]
+
+    def take(self):
+        cell = self.sample()
+        if cell is not None:
+            self.remove(cell)
+        return cell
@@ -0,0 +1,87 @@
+from collections import deque
+from perf_stats import percentile
+
+# Speed level -> simulation ticks per second; level 2 is the original 100 ms tick,
+# the fastest levels are meant for fast-forwarding replays
+SPEED_LEVELS = (5, 10, 15, 20, 30, 60, 120, 240, 480)
+DEFAULT_SPEED_LEVEL = 1
+
+
+class FixedStepClock:
+    """Fixed-timestep scheduler using an accumulator.
+
+    advance(now) returns how many simulation ticks are due, so the logic runs
+    at exactly tick_rate per second of wall time no matter when the driving
+    timer actually fires. After a stall the missed ticks are replayed
+    back-to-back, capped at max_catch_up; anything beyond the cap is dropped
+    and counted.
+    """
+
+    def __init__(self, speed_level=DEFAULT_SPEED_LEVEL, max_catch_up=5):
+        self.max_catch_up = max_catch_up
+        self.speed_level = speed_level
+        self.tick_rate = SPEED_LEVELS[speed_level]
+        self.last_time = None
+        self.accumulator = 0.0
+        self.dropped_ticks = 0
+
+    @property
+    def period(self):
+        return 1.0 / self.tick_rate
+
+    def interval_ms(self):
+        return max(1, int(1000 * self.period))
+
+    def set_speed_level(self, level):
+        self.speed_level = max(0, min(len(SPEED_LEVELS) - 1, level))
+        self.tick_rate = SPEED_LEVELS[self.speed_level]
+
+    def start(self, now):
+        # Also used on resume, so a pause never turns into a burst of ticks
+        self.last_time = now
+        self.accumulator = 0.0
+
+    def advance(self, now):
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        ticks = int(self.accumulator / self.period)
+        self.accumulator -= ticks * self.period
+        if ticks > self.max_catch_up:
+            self.dropped_ticks += ticks - self.max_catch_up
+            ticks = self.max_catch_up
+        return ticks
+
+
+class FrameStats:
+    """Rolling record of tick intervals and paint times, in milliseconds."""
+
+    def __init__(self, window=300):
+        self.tick_intervals = deque(maxlen=window)
+        self.frame_times = deque(maxlen=window)
+        self.last_tick = None
+
+    def record_tick(self, now):
+        if self.last_tick is not None:
+            self.tick_intervals.append(1000 * (now - self.last_tick))
+        self.last_tick = now
+
+    def record_frame(self, seconds):
+        self.frame_times.append(1000 * seconds)
+
+    def reset(self):
+        self.tick_intervals.clear()
+        self.frame_times.clear()
+        self.last_tick = None
+
+    def summary(self, clock):
+        if not self.tick_intervals or not self.frame_times:
+            return (f"Tick -/{clock.tick_rate} Hz (speed {clock.speed_level + 1})\n"
+                    f"Frame -  dropped {clock.dropped_ticks}")
+        mean_interval = sum(self.tick_intervals) / len(self.tick_intervals)
+        measured_rate = 1000 / mean_interval if mean_interval else 0.0
+        return (f"Tick {measured_rate:.1f}/{clock.tick_rate} Hz (speed {clock.speed_level + 1})  "
+                f"jitter p95 {percentile(self.tick_intervals, 0.95) - 1000 * clock.period:+.1f} ms\n"
+                f"Frame p50 {percentile(self.frame_times, 0.50):.2f} ms  "
+                f"p95 {percentile(self.frame_times, 0.95):.2f} ms  "
+                f"p99 {percentile(self.frame_times, 0.99):.2f} ms  "
+                f"dropped {clock.dropped_ticks}")
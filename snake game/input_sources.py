@@ -0,0 +1,66 @@
+from PyQt5.QtCore import Qt
+
+
+class InputSource:
+    """Something that steers the snake, plugged into SnakeGame.
+
+    Sources can turn the snake straight away from key_pressed, or hand the
+    engine a direction each tick from before_tick. A source that runs out of
+    input (a finished script) sets finished and the game ends.
+    """
+
+    finished = False
+
+    def attach(self, game):
+        self.game = game
+
+    def controls(self):
+        # Optional layout shown above the board
+        return None
+
+    def reset(self):
+        self.finished = False
+
+    def key_pressed(self, key):
+        return False
+
+    def before_tick(self, state):
+        return None
+
+    def after_tick(self, state):
+        pass
+
+    def refresh_stats(self, clock):
+        pass
+
+    def stop(self):
+        pass
+
+
+class KeyboardInput(InputSource):
+    KEYS = {
+        Qt.Key_A: 'LEFT',
+        Qt.Key_D: 'RIGHT',
+        Qt.Key_W: 'UP',
+        Qt.Key_S: 'DOWN',
+    }
+
+    def key_pressed(self, key):
+        direction = self.KEYS.get(key)
+        if direction is None:
+            return False
+        self.game.state.turn(direction)
+        return True
+
+
+class ScriptedInput(InputSource):
+    """Feeds a fixed sequence of directions, one per tick (e.g. a replay)."""
+
+    def __init__(self, directions):
+        self.directions = iter(directions)
+
+    def before_tick(self, state):
+        direction = next(self.directions, None)
+        if direction is None:
+            self.finished = True
+        return direction
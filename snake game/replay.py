@@ -0,0 +1,149 @@
+import argparse
+import sys
+import time
+from snake_core import SnakeState
+
+# File layout: magic, then varints seed, cols, rows, obstacle ratio in parts per
+# million, ticks, final score, won flag, and finally the direction stream.
+# The stream is run-length coded: one varint (run_length << 2 | direction) per
+# stretch of ticks that moved in the same direction.
+REPLAY_MAGIC = b'SNKR\x01'
+DIRECTION_CODES = ('LEFT', 'RIGHT', 'UP', 'DOWN')
+DIRECTION_INDEX = {name: index for index, name in enumerate(DIRECTION_CODES)}
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated replay")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, cols, rows, obstacle_ratio):
+        self.seed = seed
+        self.cols = cols
+        self.rows = rows
+        self.obstacle_ratio = obstacle_ratio
+        self.ticks = 0
+        self.score = 0
+        self.won = False
+        self.runs = []  # [direction index, run length]
+
+    @classmethod
+    def for_state(cls, state):
+        return cls(state.seed, state.cols, state.rows, state.obstacle_ratio)
+
+    def record(self, state):
+        # Call after every SnakeState.step() with the direction it moved in
+        code = DIRECTION_INDEX[state.direction]
+        if self.runs and self.runs[-1][0] == code:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([code, 1])
+        self.ticks = state.ticks
+        self.score = state.score
+        self.won = state.won
+
+    def directions(self):
+        for code, length in self.runs:
+            name = DIRECTION_CODES[code]
+            for _ in range(length):
+                yield name
+
+    def new_state(self):
+        return SnakeState(self.cols, self.rows, seed=self.seed, obstacle_ratio=self.obstacle_ratio)
+
+    def to_bytes(self):
+        out = bytearray(REPLAY_MAGIC)
+        for value in (self.seed, self.cols, self.rows, round(self.obstacle_ratio * 1e6),
+                      self.ticks, self.score, int(self.won)):
+            write_varint(out, value)
+        for code, length in self.runs:
+            write_varint(out, length << 2 | code)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if not data.startswith(REPLAY_MAGIC):
+            raise ValueError("Not a snake replay")
+        offset = len(REPLAY_MAGIC)
+        header = []
+        for _ in range(7):
+            value, offset = read_varint(data, offset)
+            header.append(value)
+        seed, cols, rows, ratio_ppm, ticks, score, won = header
+        replay = cls(seed, cols, rows, ratio_ppm / 1e6)
+        replay.ticks = ticks
+        replay.score = score
+        replay.won = bool(won)
+        while offset < len(data):
+            value, offset = read_varint(data, offset)
+            replay.runs.append([value & 3, value >> 2])
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+def play(replay):
+    """Re-simulate a replay headlessly and return the final SnakeState."""
+    state = replay.new_state()
+    for direction in replay.directions():
+        state.turn(direction)
+        if not state.step():
+            break
+    return state
+
+
+def verify(replay):
+    # True when the current rules reproduce the recorded result
+    state = play(replay)
+    return (state.ticks, state.score, state.won) == (replay.ticks, replay.score, replay.won)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate snake replays headlessly and check their results")
+    parser.add_argument('replays', nargs='+')
+    args = parser.parse_args()
+
+    total_ticks = 0
+    mismatches = 0
+    started = time.perf_counter()
+    for path in args.replays:
+        replay = Replay.load(path)
+        state = play(replay)
+        total_ticks += state.ticks
+        if (state.ticks, state.score, state.won) != (replay.ticks, replay.score, replay.won):
+            mismatches += 1
+            print(f"MISMATCH {path}: recorded {replay.ticks} ticks / score {replay.score}, "
+                  f"replayed {state.ticks} ticks / score {state.score}")
+    elapsed = time.perf_counter() - started
+    print(f"{len(args.replays)} replays, {total_ticks} ticks in {elapsed:.2f} s "
+          f"({total_ticks / elapsed if elapsed else 0:,.0f} ticks/s), {mismatches} mismatches")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import time
+import logging
+from collections import deque
+import serial.tools.list_ports
+from PyQt5.QtWidgets import QPushButton, QLabel, QComboBox, QHBoxLayout, QMessageBox
+from PyQt5.QtCore import QTimer
+from input_sources import InputSource
+from serial_async import QtSerialBridge
+from perf_stats import percentile
+
+# Single-byte controller commands sent by snake.ino; CR/LF and unknown bytes are ignored
+COMMANDS = {
+    ord('W'): 'UP',
+    ord('A'): 'LEFT',
+    ord('S'): 'DOWN',
+    ord('D'): 'RIGHT',
+    ord('Z'): 'PAUSE',
+}
+
+
+class SerialInput(InputSource):
+    """Joystick input read straight from the serial bridge.
+
+    Bytes are decoded as soon as the bridge delivers them. The most recent
+    direction is held until the game's next tick takes it, and the delay
+    between its arrival and the tick that applied it is recorded.
+    """
+
+    def __init__(self, baud_rate=9600):
+        self.baud_rate = baud_rate
+        self.pending = None  # (direction, arrival time)
+        self.applying = None
+        self.latencies = deque(maxlen=300)
+        self.port_name = None
+
+    def attach(self, game):
+        super().attach(game)
+        self.bridge = QtSerialBridge(game)
+        self.bridge.data_received.connect(self.on_data)
+        self.bridge.error_occurred.connect(self.show_serial_error)
+
+        self.update_ports_timer = QTimer(game)
+        self.update_ports_timer.timeout.connect(self.update_com_ports)
+        self.update_ports_timer.start(1000)
+
+    def controls(self):
+        layout = QHBoxLayout()
+        self.com_ports = QComboBox(self.game)
+        self.update_com_ports()
+
+        self.frequency_selector = QComboBox(self.game)
+        self.frequency_selector.addItems([str(i) for i in range(50, 501, 50)])  # Frequencies from 50 to 500Hz
+
+        self.connect_button = QPushButton("Connect", self.game)
+        self.connect_button.clicked.connect(self.connect_serial)
+
+        self.disconnect_button = QPushButton("Disconnect", self.game)
+        self.disconnect_button.clicked.connect(self.disconnect_serial)
+        self.disconnect_button.setEnabled(False)
+
+        self.latency_label = QLabel("Input latency: -", self.game)
+
+        layout.addWidget(QLabel("COM Port:"))
+        layout.addWidget(self.com_ports)
+        layout.addWidget(QLabel("Frequency (Hz):"))
+        layout.addWidget(self.frequency_selector)
+        layout.addWidget(self.connect_button)
+        layout.addWidget(self.disconnect_button)
+        layout.addWidget(self.latency_label)
+        return layout
+
+    def update_com_ports(self):
+        ports = [port.device for port in serial.tools.list_ports.comports()]
+        current_ports = [self.com_ports.itemText(i) for i in range(self.com_ports.count())]
+        if set(ports) != set(current_ports):
+            self.com_ports.clear()
+            self.com_ports.addItems(ports)
+
+    def connect_serial(self):
+        selected_port = self.com_ports.currentText()
+        if selected_port:
+            self.port_name = selected_port
+            self.bridge.open_port(selected_port, self.baud_rate)
+            self.connect_button.setEnabled(False)
+            self.disconnect_button.setEnabled(True)
+        else:
+            self.show_warning("No COM port selected.", "Please select a COM port before connecting.")
+
+    def disconnect_serial(self):
+        if self.port_name and self.bridge.is_open(self.port_name):
+            self.bridge.close_port(self.port_name)
+            self.port_name = None
+            self.connect_button.setEnabled(True)
+            self.disconnect_button.setEnabled(False)
+        else:
+            self.show_warning("No active connection.", "There is no active serial connection to disconnect.")
+
+    def reset(self):
+        super().reset()
+        self.pending = None
+        self.applying = None
+
+    def on_data(self, port_name, data):
+        arrived = time.perf_counter()
+        for byte in data:
+            command = COMMANDS.get(byte)
+            if command == 'PAUSE':
+                self.game.request_pause()
+            elif command is not None:
+                # Only the latest direction matters for the next tick
+                self.pending = (command, arrived)
+
+    def before_tick(self, state):
+        # Apply the latest joystick direction buffered since the previous tick
+        command = self.pending
+        self.pending = None
+        if command is None:
+            return None
+        self.applying = command[1]
+        return command[0]
+
+    def after_tick(self, state):
+        if self.applying is not None:
+            self.latencies.append(1000 * (time.perf_counter() - self.applying))
+            self.applying = None
+
+    def summary(self):
+        if not self.latencies:
+            return "Input latency: -"
+        return (f"Input latency p50 {percentile(self.latencies, 0.50):.1f} ms  "
+                f"p95 {percentile(self.latencies, 0.95):.1f} ms")
+
+    def refresh_stats(self, clock):
+        logging.debug(self.summary())
+        self.latency_label.setText(f"{self.summary()} (tick {1000 * clock.period:.0f} ms)")
+
+    def show_warning(self, title, message):
+        msg_box = QMessageBox()
+        msg_box.setIcon(QMessageBox.Warning)
+        msg_box.setWindowTitle(title)
+        msg_box.setText(message)
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+
+    def show_serial_error(self, port_name, message):
+        msg_box = QMessageBox()
+        msg_box.setIcon(QMessageBox.Critical)
+        msg_box.setWindowTitle("Serial Error")
+        msg_box.setText(message)
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+        self.connect_button.setEnabled(True)
+        self.disconnect_button.setEnabled(False)
+
+    def stop(self):
+        self.bridge.stop()
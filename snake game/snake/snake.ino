@@ -8,26 +8,50 @@ const int SW3_THRESHOLD = 500;  // Down
 const int SW4_THRESHOLD = 700;  // Right
 const int SW5_THRESHOLD = 900;  // Center (press)
 
+const unsigned long DEBOUNCE_MS = 5;  // A position must be stable this long before it is sent
+
+char lastSent = 0;       // Last command written to the serial port
+char candidate = 0;      // Position currently being debounced
+unsigned long candidateSince = 0;
+
 void setup() {
   Serial.begin(9600);  // Initialize serial communication
   pinMode(SW_PIN, INPUT);  // Set SW_PIN as input
 }
 
-void loop() {
+char readPosition() {
   int sw_value = analogRead(SW_PIN);  // Read the analog value
 
-  // Determine which position the joystick is in and send the corresponding character
+  // Determine which position the joystick is in
   if (sw_value < SW1_THRESHOLD) {
-    Serial.print("A\r\n");  // SW1: Left
+    return 'A';  // SW1: Left
   } else if (sw_value < SW2_THRESHOLD) {
-    Serial.print("W\r\n");  // SW2: Up
+    return 'W';  // SW2: Up
   } else if (sw_value < SW3_THRESHOLD) {
-    Serial.print("S\r\n");  // SW3: Down
+    return 'S';  // SW3: Down
   } else if (sw_value < SW4_THRESHOLD) {
-    Serial.print("D\r\n");  // SW4: Right
+    return 'D';  // SW4: Right
   } else if (sw_value < SW5_THRESHOLD) {
-    Serial.print("Z\r\n");  // SW5: Center press (acts like space key)
+    return 'Z';  // SW5: Center press (acts like space key)
   }
+  return 0;  // Released
+}
 
-  delay(100);  // Add a small delay to avoid overwhelming the serial communication
+void loop() {
+  char position = readPosition();
+  unsigned long now = millis();
+
+  if (position != candidate) {
+    candidate = position;
+    candidateSince = now;
+  }
+
+  // Send a single byte as soon as a new position is stable, instead of
+  // repeating it every 100 ms; the game keeps the last direction anyway
+  if (candidate != lastSent && now - candidateSince >= DEBOUNCE_MS) {
+    if (candidate != 0) {
+      Serial.write(candidate);
+    }
+    lastSent = candidate;
+  }
 }
@@ -0,0 +1,155 @@
+import argparse
+import time
+import numpy as np
+from snake_core import OBSTACLE_RATIO, START_BODY
+
+# Action indices used by the batch environment
+LEFT, RIGHT, UP, DOWN = range(4)
+ACTION_NAMES = ('LEFT', 'RIGHT', 'UP', 'DOWN')
+DELTA_X = np.array([-1, 1, 0, 0])
+DELTA_Y = np.array([0, 0, -1, 1])
+OPPOSITE_ACTION = np.array([RIGHT, LEFT, DOWN, UP])
+
+NEVER = np.iinfo(np.int64).min // 2  # Entry tick of a cell the snake never visited
+
+
+class BatchSnakeEnv:
+    """Steps many independent snake games at once with array operations.
+
+    Follows the same rules as snake_core.SnakeState. Instead of a body list,
+    every cell stores the tick at which the head last entered it; a cell is
+    body iff ticks - entered < length. Moving the head is one scatter and
+    growing is just length += 1, so a step costs O(games) regardless of how
+    long the snakes are. Finished games are reset automatically.
+    """
+
+    def __init__(self, num_games, cols, rows, seed=None, obstacle_ratio=OBSTACLE_RATIO):
+        if cols < 8 or rows < 6:
+            raise ValueError(f"Grid {cols}x{rows} is too small, need at least 8x6")
+        self.num_games = num_games
+        self.cols = cols
+        self.rows = rows
+        self.num_cells = cols * rows
+        self.obstacle_count = int(obstacle_ratio * self.num_cells)
+        self.rng = np.random.default_rng(seed)
+
+        self.entered = np.full((num_games, self.num_cells), NEVER, dtype=np.int64)
+        self.obstacles = np.zeros((num_games, self.num_cells), dtype=bool)
+        self.head_x = np.zeros(num_games, dtype=np.int64)
+        self.head_y = np.zeros(num_games, dtype=np.int64)
+        self.direction = np.full(num_games, RIGHT, dtype=np.int64)
+        self.length = np.zeros(num_games, dtype=np.int64)
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.food = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.rows_index = np.arange(num_games)
+        self.start_cells = np.array([y * cols + x for x, y in START_BODY])
+        self.reset()
+
+    def reset(self, games=None):
+        if games is None:
+            games = self.rows_index
+        count = len(games)
+        if count == 0:
+            return
+
+        self.entered[games] = NEVER
+        # Head enters at tick 0, the older segments before it
+        for age, cell in enumerate(self.start_cells):
+            self.entered[games, cell] = -age
+        self.head_x[games] = START_BODY[0][0]
+        self.head_y[games] = START_BODY[0][1]
+        self.direction[games] = RIGHT
+        self.length[games] = len(START_BODY)
+        self.ticks[games] = 0
+        self.score[games] = 0
+
+        # Food and obstacles are the lowest draws of a random key over the free cells
+        keys = self.rng.random((count, self.num_cells))
+        keys[:, self.start_cells] = np.inf
+        chosen = np.argpartition(keys, self.obstacle_count, axis=1)[:, :self.obstacle_count + 1]
+        self.food[games] = chosen[:, 0]
+        self.obstacles[games] = False
+        self.obstacles[games[:, None], chosen[:, 1:]] = True
+
+    def occupied(self, games):
+        # Body, obstacle or food mask of shape (len(games), num_cells)
+        body = self.ticks[games, None] - self.entered[games] < self.length[games, None]
+        mask = body | self.obstacles[games]
+        mask[np.arange(len(games)), self.food[games]] = True
+        return mask
+
+    def step(self, actions):
+        """Advance every game one tick; returns (rewards, dones, won)."""
+        actions = np.asarray(actions, dtype=np.int64)
+        reverse = actions == OPPOSITE_ACTION[self.direction]
+        self.direction = np.where(reverse, self.direction, actions)
+
+        head_x = self.head_x + DELTA_X[self.direction]
+        head_y = self.head_y + DELTA_Y[self.direction]
+        inside = (head_x >= 0) & (head_x < self.cols) & (head_y >= 0) & (head_y < self.rows)
+        head = np.where(inside, head_y * self.cols + head_x, 0)
+        self.ticks += 1
+
+        ate = inside & (head == self.food)
+        length = self.length + ate
+        # The tail cell is already vacated unless the snake grows this tick
+        hit_body = self.ticks - self.entered[self.rows_index, head] < length
+        hit_obstacle = self.obstacles[self.rows_index, head]
+        dead = ~inside | hit_body | hit_obstacle
+
+        alive = ~dead
+        moved = self.rows_index[alive]
+        self.entered[moved, head[alive]] = self.ticks[alive]
+        self.head_x = np.where(alive, head_x, self.head_x)
+        self.head_y = np.where(alive, head_y, self.head_y)
+        self.length = np.where(alive, length, self.length)
+        ate &= alive
+        self.score += ate
+
+        won = np.zeros(self.num_games, dtype=bool)
+        eaters = self.rows_index[ate]
+        if len(eaters):
+            free = ~self.occupied(eaters)
+            keys = np.where(free, self.rng.random(free.shape), -1.0)
+            self.food[eaters] = keys.argmax(axis=1)
+            full = ~free.any(axis=1)
+            won[eaters[full]] = True
+
+        dones = dead | won
+        rewards = ate.astype(np.float32) - dead.astype(np.float32)
+        self.reset(self.rows_index[dones])
+        return rewards, dones, won
+
+    def observe(self):
+        # (games, 3, rows, cols) planes: body, obstacles, food
+        planes = np.zeros((self.num_games, 3, self.num_cells), dtype=np.float32)
+        planes[:, 0] = self.ticks[:, None] - self.entered < self.length[:, None]
+        planes[:, 1] = self.obstacles
+        planes[self.rows_index, 2, self.food] = 1.0
+        return planes.reshape(self.num_games, 3, self.rows, self.cols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the batched snake environment with random actions")
+    parser.add_argument('--games', type=int, default=4096)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    env = BatchSnakeEnv(args.games, args.cols, args.rows, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, 4, size=(args.steps, args.games))
+    episodes = 0
+    started = time.perf_counter()
+    for step in range(args.steps):
+        _, dones, _ = env.step(actions[step])
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - started
+    print(f"{args.games * args.steps / elapsed:,.0f} steps/s over {args.games} games, {episodes} episodes finished")
+
+
+if __name__ == "__main__":
+    main()
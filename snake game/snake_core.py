@@ -0,0 +1,106 @@
+import random
+from collections import deque
+from free_cells import FreeCellIndex
+
+# Grid steps per direction, y grows downwards like the screen
+DIRECTIONS = {
+    'LEFT': (-1, 0),
+    'RIGHT': (1, 0),
+    'UP': (0, -1),
+    'DOWN': (0, 1),
+}
+OPPOSITE = {'LEFT': 'RIGHT', 'RIGHT': 'LEFT', 'UP': 'DOWN', 'DOWN': 'UP'}
+
+OBSTACLE_RATIO = 0.03  # 3% of the grid
+START_BODY = ((5, 5), (4, 5), (3, 5))  # Head first, heading right
+MIN_COLS = 8
+MIN_ROWS = 6
+
+
+class SnakeState:
+    """Qt-free snake rules on a cols x rows grid.
+
+    Positions are (column, row) cells. All randomness comes from one seeded
+    random.Random, so a seed plus the sequence of turns fully determines a game.
+    """
+
+    def __init__(self, cols, rows, seed=None, obstacle_ratio=OBSTACLE_RATIO):
+        if cols < MIN_COLS or rows < MIN_ROWS:
+            raise ValueError(f"Grid {cols}x{rows} is too small, need at least {MIN_COLS}x{MIN_ROWS}")
+        self.cols = cols
+        self.rows = rows
+        # Always keep a concrete seed so every game can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.obstacle_ratio = obstacle_ratio
+        self.reset()
+
+    def reset(self):
+        self.rng = random.Random(self.seed)
+        self.body = deque(START_BODY)
+        self.body_cells = set(self.body)
+        self.direction = 'RIGHT'
+        self.next_direction = 'RIGHT'
+        self.score = 0
+        self.ticks = 0
+        self.alive = True
+        self.won = False
+        # Cells changed by the last step, for incremental consumers
+        self.vacated = None
+        self.ate = False
+
+        self.free_cells = FreeCellIndex(
+            ((x, y) for y in range(self.rows) for x in range(self.cols)), rng=self.rng)
+        for cell in self.body:
+            self.free_cells.remove(cell)
+        self.food = self.free_cells.take()
+        obstacle_count = int(self.obstacle_ratio * self.rows * self.cols)
+        self.obstacles = [self.free_cells.take() for _ in range(min(obstacle_count, len(self.free_cells)))]
+        self.obstacle_cells = set(self.obstacles)
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def turn(self, direction):
+        # Reversing straight into the neck is ignored
+        if direction in DIRECTIONS and direction != OPPOSITE[self.direction]:
+            self.next_direction = direction
+
+    def step(self):
+        if not self.alive:
+            return False
+        if self.next_direction != OPPOSITE[self.direction]:
+            self.direction = self.next_direction
+        self.ticks += 1
+        self.vacated = None
+        self.ate = False
+
+        dx, dy = DIRECTIONS[self.direction]
+        head_x, head_y = self.body[0]
+        head = (head_x + dx, head_y + dy)
+
+        if not (0 <= head[0] < self.cols and 0 <= head[1] < self.rows) or head in self.obstacle_cells:
+            self.alive = False
+            return False
+
+        self.ate = head == self.food
+        if not self.ate:
+            # Vacate the tail first, the head may move into the cell it leaves
+            self.vacated = self.body.pop()
+            self.body_cells.discard(self.vacated)
+            self.free_cells.add(self.vacated)
+        if head in self.body_cells:
+            self.alive = False
+            return False
+        self.body.appendleft(head)
+        self.body_cells.add(head)
+        self.free_cells.remove(head)
+
+        if self.ate:  # Grow by keeping the tail
+            self.score += 1
+            self.food = self.free_cells.take()
+            if self.food is None:  # No empty cell left, the board is full
+                self.won = True
+                self.alive = False
+                return False
+        return True
@@ -0,0 +1,348 @@
+import argparse
+import os
+import sys
+import time
+import logging
+
+# perf_stats and serial_async are shared with the scripts in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog
+from PyQt5.QtCore import Qt, QTimer, QRect, QPoint
+from PyQt5.QtGui import QPainter, QColor, QFont
+from snake_core import SnakeState, MIN_COLS, MIN_ROWS
+from board_renderer import BoardRenderer, BoardGeometry, grid_for_area
+from game_clock import FixedStepClock, FrameStats
+from replay import Replay
+from input_sources import ScriptedInput
+
+class SnakeGame(QMainWindow):
+    def __init__(self, inputs, title="Snake Game", cell_size=20, board=None):
+        super().__init__()
+
+        self.setWindowTitle(title)
+        self.setGeometry(100, 100, 600, 600)
+        # Either the board fills the window with cells of cell_size logical
+        # pixels, or a fixed (cols, rows) board is scaled to fit the window
+        self.cell_size = cell_size
+        self.board = board
+        self.cols, self.rows = board or (0, 0)
+        self.renderer = BoardRenderer()
+        self.watching = None  # Replay to play back on the next start_game
+
+        # Every source that can steer the snake; while a replay is being
+        # watched only its ScriptedInput is consulted
+        self.inputs = list(inputs)
+        self.active_inputs = self.inputs
+        for source in self.inputs:
+            source.attach(self)
+
+        # Initialize game variables
+        self.init_game_variables()
+
+        # Initialize UI
+        self.init_ui()
+
+        # Initialize timers
+        self.init_timers()
+
+    def init_ui(self):
+        self.top_widget = QWidget(self)
+        self.setCentralWidget(self.top_widget)
+        self.top_layout = QVBoxLayout(self.top_widget)
+
+        # Input sources may bring their own controls, e.g. the serial port selector
+        for source in self.inputs:
+            controls = source.controls()
+            if controls is not None:
+                self.top_layout.addLayout(controls)
+
+        # Set up game UI elements
+        self.game_layout = QVBoxLayout()
+        self.score_label = QLabel(f"Score: {self.score}", self)
+        self.score_label.setAlignment(Qt.AlignCenter)
+        self.score_label.setFont(QFont("Arial", 16))
+        self.game_layout.addWidget(self.score_label)
+
+        self.start_button = QPushButton("Start Game", self)
+        self.start_button.clicked.connect(self.start_game)
+        self.game_layout.addWidget(self.start_button)
+
+        self.restart_button = QPushButton("Restart Game", self)
+        self.restart_button.clicked.connect(self.restart_game)
+        self.restart_button.setVisible(False)
+        self.game_layout.addWidget(self.restart_button)
+
+        self.exit_button = QPushButton("Exit", self)
+        self.exit_button.clicked.connect(self.close)
+        self.exit_button.setVisible(False)
+        self.game_layout.addWidget(self.exit_button)
+
+        self.save_replay_button = QPushButton("Save Replay", self)
+        self.save_replay_button.clicked.connect(self.save_replay)
+        self.game_layout.addWidget(self.save_replay_button)
+        self.save_replay_button.setVisible(False)
+
+        self.watch_replay_button = QPushButton("Watch Replay", self)
+        self.watch_replay_button.clicked.connect(self.watch_replay)
+        self.game_layout.addWidget(self.watch_replay_button)
+
+        self.top_layout.addLayout(self.game_layout)
+        # Keep the controls at the top, the rest of the window is the board
+        self.top_layout.addStretch(1)
+
+    def init_game_variables(self):
+        # The rules live in the Qt-free SnakeState, created once the grid size is known
+        self.state = None
+        self.replay = None
+        self.score = 0
+        self.game_over_flag = False
+        self.paused = False
+        self.game_started = False
+
+    def init_timers(self):
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.game_loop)
+        self.clock = FixedStepClock()
+        self.frame_stats = FrameStats()
+        self.show_stats = False
+
+        # Refreshes the frame-time overlay and log once per second
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.refresh_stats)
+        self.stats_timer.start(1000)
+
+    def board_area(self):
+        # Window area below the score label, the board must not run under the controls
+        top = self.score_label.mapTo(self, QPoint(0, self.score_label.height())).y() + 1
+        return QRect(0, top, self.width(), max(1, self.height() - top))
+
+    def resizeEvent(self, event):
+        # The cell-to-pixel transform is only recomputed when the window changes size
+        if self.state is not None:
+            self.reset_board()
+
+    def reset_board(self):
+        geometry = BoardGeometry(self.board_area(), self.state.cols, self.state.rows)
+        self.renderer.reset(self.state, geometry, self.size(), self.palette().window().color(),
+                            self.devicePixelRatioF())
+        self.update()
+
+    def start_game(self):
+        self.start_button.setVisible(False)
+        self.restart_button.setVisible(False)
+        self.exit_button.setVisible(False)
+        self.save_replay_button.setVisible(False)
+        self.watch_replay_button.setVisible(False)
+        watching = self.watching
+        self.watching = None
+        self.init_game_variables()
+        if watching is not None:
+            self.state = watching.new_state()
+            playback = ScriptedInput(watching.directions())
+            playback.attach(self)
+            self.active_inputs = [playback]
+        else:
+            if self.board is None:
+                cols, rows = grid_for_area(self.board_area(), self.cell_size)
+                # A small window gets the smallest playable grid with smaller cells
+                self.cols, self.rows = max(MIN_COLS, cols), max(MIN_ROWS, rows)
+            self.state = SnakeState(self.cols, self.rows)
+            self.active_inputs = self.inputs
+        for source in self.active_inputs:
+            source.reset()
+        self.replay = Replay.for_state(self.state)
+        self.reset_board()
+        self.score = 0
+        self.game_over_flag = False
+        self.game_started = True
+        self.paused = False
+        self.start_clock()
+        self.update()
+
+    def restart_game(self):
+        self.start_game()
+
+    def watch_replay(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Watch Replay", "", "Snake Replay (*.snkr)")
+        if path:
+            self.watching = Replay.load(path)
+            self.start_game()
+
+    def save_replay(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Replay", "snake_replay.snkr", "Snake Replay (*.snkr)")
+        if path:
+            self.replay.save(path)
+
+    def start_clock(self):
+        self.clock.start(time.perf_counter())
+        self.frame_stats.reset()
+        self.timer.start(self.clock.interval_ms())
+
+    def change_speed(self, step):
+        self.clock.set_speed_level(self.clock.speed_level + step)
+        self.timer.setInterval(self.clock.interval_ms())
+        self.refresh_stats()
+
+    def stats_rect(self):
+        return QRect(5, self.height() - 50, 600, 45)
+
+    def refresh_stats(self):
+        if not self.game_started:
+            return
+        summary = self.frame_stats.summary(self.clock)
+        logging.debug(summary.replace('\n', ' | '))
+        for source in self.inputs:
+            source.refresh_stats(self.clock)
+        if self.show_stats:
+            self.update(self.stats_rect())
+
+    def paintEvent(self, event):
+        if not self.game_started:
+            return
+
+        paint_start = time.perf_counter()
+        painter = QPainter(self)
+        self.renderer.paint(painter, event.rect())
+
+        if self.game_over_flag:
+            self.draw_game_over_screen(painter)
+        elif self.paused:
+            self.draw_pause_screen(painter)
+
+        if self.show_stats:
+            self.draw_stats_overlay(painter)
+        painter.end()
+        self.frame_stats.record_frame(time.perf_counter() - paint_start)
+
+    def draw_stats_overlay(self, painter):
+        painter.setPen(QColor(0, 0, 0))
+        painter.setFont(QFont("Monospace", 9))
+        painter.drawText(self.stats_rect(), Qt.AlignLeft | Qt.AlignBottom, self.frame_stats.summary(self.clock))
+
+    def draw_game_over_screen(self, painter):
+        painter.setBrush(QColor(255, 0, 0, 128))
+        painter.drawRect(0, 0, self.width(), self.height())
+        painter.setPen(QColor(255, 255, 255))
+        painter.setFont(QFont("Arial", 24))
+        title = "Board Full!" if self.state.won else "Game Over!"
+        painter.drawText(self.rect(), Qt.AlignCenter, f"{title}\nScore: {self.score}")
+
+    def draw_pause_screen(self, painter):
+        painter.setBrush(QColor(0, 0, 0, 128))
+        painter.drawRect(0, 0, self.width(), self.height())
+        painter.setPen(QColor(255, 255, 255))
+        painter.setFont(QFont("Arial", 24))
+        painter.drawText(self.rect(), Qt.AlignCenter, "Game Paused\nPress P to Resume")
+
+    def keyPressEvent(self, event):
+        if not self.game_started or self.game_over_flag:
+            return
+
+        key = event.key()
+
+        if key == Qt.Key_Space or key == Qt.Key_P:  # Pause with space or P
+            self.toggle_pause()
+        elif key == Qt.Key_F:  # Frame-time overlay
+            self.show_stats = not self.show_stats
+            self.update(self.stats_rect())
+        elif key in (Qt.Key_Plus, Qt.Key_Equal):
+            self.change_speed(1)
+        elif key == Qt.Key_Minus:
+            self.change_speed(-1)
+        else:
+            for source in self.active_inputs:
+                if source.key_pressed(key):
+                    break
+
+    def game_loop(self):
+        if not self.game_over_flag and self.game_started and not self.paused:
+            now = time.perf_counter()
+            self.frame_stats.record_tick(now)
+            # Run however many fixed ticks are due, rendering stays asynchronous
+            for _ in range(self.clock.advance(now)):
+                for source in self.active_inputs:
+                    direction = source.before_tick(self.state)
+                    if direction is not None:
+                        self.state.turn(direction)
+                if any(source.finished for source in self.active_inputs):  # e.g. end of a recording
+                    self.game_over()
+                    break
+                alive = self.state.step()
+                self.replay.record(self.state)
+                for source in self.active_inputs:
+                    source.after_tick(self.state)
+                # Only invalidate the changed cells; Qt coalesces them into the next paint
+                for rect in self.renderer.update(self.state):
+                    self.update(rect)
+                if not alive:
+                    self.game_over()
+                    break
+            if self.score != self.state.score:
+                self.score = self.state.score
+                self.score_label.setText(f"Score: {self.score}")
+
+    def game_over(self):
+        self.timer.stop()
+        self.game_over_flag = True
+        self.restart_button.setVisible(True)
+        self.exit_button.setVisible(True)
+        self.save_replay_button.setVisible(True)
+        self.watch_replay_button.setVisible(True)
+        self.update()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.start_clock()
+            self.paused = False
+        else:
+            self.timer.stop()
+            self.paused = True
+        self.update()
+
+    def request_pause(self):
+        # Pause requests from input sources are ignored outside a running game
+        if self.game_started and not self.game_over_flag:
+            self.toggle_pause()
+
+    def closeEvent(self, event):
+        for source in self.inputs:
+            source.stop()
+        event.accept()
+
+
+def board_size(text):
+    parts = text.lower().split('x')
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, e.g. 96x54, not {text!r}")
+    cols, rows = int(parts[0]), int(parts[1])
+    if cols < MIN_COLS or rows < MIN_ROWS:
+        raise argparse.ArgumentTypeError(f"board must be at least {MIN_COLS}x{MIN_ROWS}")
+    return cols, rows
+
+
+def cell_size(text):
+    if not text.isdigit() or int(text) < 1:
+        raise argparse.ArgumentTypeError(f"cell size must be a positive number of pixels, not {text!r}")
+    return int(text)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Snake game")
+    parser.add_argument('--cell-size', type=cell_size, default=20,
+                        help="Cell size in logical pixels when the board fills the window")
+    parser.add_argument('--board', metavar='COLSxROWS',
+                        type=board_size,
+                        help="Fixed board size, scaled to fit the window")
+    parser.add_argument('--autoplay', action='store_true', help="Start with the autopilot steering")
+    # Leave Qt's own options to QApplication
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
+def create_application(argv):
+    # Logical pixels follow the screen scale factor, so cells keep their size on 4K screens
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    return QApplication(argv)
@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+# The scripts live at the repository root and in "snake game", not in a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'snake game')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Run Qt without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope='session')
+def app():
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
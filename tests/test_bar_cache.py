@@ -0,0 +1,54 @@
+import numpy as np
+from bar_cache import BarCache
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+
+
+def make_bars(first_time, count):
+    rates = np.zeros(count, RATES_DTYPE)
+    rates['time'] = first_time + 60 * np.arange(count)
+    rates['close'] = np.arange(count)
+    return rates
+
+
+class FakeMT5:
+    def __init__(self, bars):
+        self.bars = bars
+
+    def add_bars(self, count):
+        self.bars = np.concatenate([self.bars, make_bars(self.bars['time'][-1] + 60, count)])
+
+    def copy_rates_from_pos(self, symbol, timeframe, position, count):
+        return self.bars[len(self.bars) - position - count:len(self.bars) - position]
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        times = self.bars['time']
+        return self.bars[(times >= date_from.timestamp()) & (times <= date_to.timestamp())]
+
+    def last_error(self):
+        return (1, 'Success')
+
+
+def test_sync_fills_every_bar_since_the_last_cached_one(tmp_path):
+    mt5 = FakeMT5(make_bars(0, 100))
+    cache = BarCache(tmp_path, 'EURUSD', 1)
+    assert cache.sync(mt5, initial_bars=100) == 100
+
+    # Several bars form between two polls
+    mt5.add_bars(10)
+    assert BarCache(tmp_path, 'EURUSD', 1).sync(mt5) == 10
+
+    cache = BarCache(tmp_path, 'EURUSD', 1)
+    assert cache.count == 110
+    assert np.array_equal(np.diff(cache.column('time')), np.full(109, 60))
+
+
+def test_refetched_last_bar_replaces_the_cached_one(tmp_path):
+    mt5 = FakeMT5(make_bars(0, 5))
+    cache = BarCache(tmp_path, 'EURUSD', 1)
+    cache.sync(mt5, initial_bars=5)
+    mt5.bars['close'][-1] = 42.0
+    assert cache.sync(mt5) == 0
+    assert cache.count == 5
+    assert cache.columns(last=1)['close'][0] == 42.0
@@ -0,0 +1,32 @@
+import os
+import pytest
+import nn_grid
+from nn_experiments import make_config
+
+
+def startup_environment(config, cache_dir):
+    # The environment the worker process was started with, before it imported anything
+    with open('/proc/self/environ', 'rb') as environ_file:
+        entries = environ_file.read().split(b'\0')
+    environment = dict(entry.decode().split('=', 1) for entry in entries if b'=' in entry)
+    return {'config': config, 'environment': environment}
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/environ'), reason="needs /proc")
+def test_workers_start_with_the_thread_limits(tmp_path):
+    configs = [make_config('sinc', seed=seed) for seed in range(2)]
+    results = nn_grid.run_grid(configs, str(tmp_path), jobs=2, threads_per_job=3, job=startup_environment)
+    assert len(results) == 2
+    for result in results:
+        for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+            assert result['environment'][name] == '3'
+    assert os.environ.get('OMP_NUM_THREADS') != '3'
+
+
+def test_cached_results_are_not_run_again(tmp_path):
+    config = make_config('sinc', seed=0)
+    os.makedirs(tmp_path, exist_ok=True)
+    with open(nn_grid.cache_path(str(tmp_path), config), 'w') as cache_file:
+        cache_file.write('{"config": {}, "mse": 0.5}')
+    results = nn_grid.run_grid([config], str(tmp_path), jobs=1, threads_per_job=1, job=startup_environment)
+    assert results == [{'config': {}, 'mse': 0.5}]
@@ -0,0 +1,18 @@
+from perf_stats import percentile
+from game_clock import FixedStepClock, FrameStats
+
+
+def test_percentile():
+    assert percentile([], 0.5) is None
+    assert percentile([3, 1, 2], 0.0) == 1
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile([3, 1, 2], 0.99) == 3
+
+
+def test_frame_stats_summary_before_any_ticks():
+    stats = FrameStats()
+    assert 'Frame -' in stats.summary(FixedStepClock())
+    stats.record_tick(0.0)
+    stats.record_tick(0.1)
+    stats.record_frame(0.002)
+    assert 'Frame p50 2.00 ms' in stats.summary(FixedStepClock())
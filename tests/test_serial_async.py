@@ -0,0 +1,45 @@
+import sys
+import pytest
+from serial_async import QtSerialBridge, SerialEventLoop
+from serial_multi import MultiPortCapture
+
+
+@pytest.fixture
+def tiny_switch_interval():
+    # Switch threads as often as possible so stop() often lands before run_forever()
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def test_stop_right_after_start(tiny_switch_interval):
+    for _ in range(500):
+        event_loop = SerialEventLoop()
+        event_loop.start()
+        event_loop.stop()
+        event_loop.join(timeout=2)
+        assert not event_loop.is_alive()
+        assert event_loop.loop.is_closed()
+
+
+def test_stop_before_start():
+    event_loop = SerialEventLoop()
+    event_loop.stop()
+    event_loop.start()
+    event_loop.join(timeout=2)
+    assert not event_loop.is_alive()
+    # Stopping a finished loop is a no-op
+    event_loop.stop()
+
+
+def test_bridge_and_capture_stop_right_after_start(tiny_switch_interval):
+    for _ in range(100):
+        bridge = QtSerialBridge()
+        bridge.stop()
+        assert not bridge.event_loop.is_alive()
+        capture = MultiPortCapture(mode='asyncio')
+        capture.start()
+        event_loop = capture.readers[0]
+        capture.stop()
+        assert not event_loop.is_alive()
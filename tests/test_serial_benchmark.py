@@ -0,0 +1,12 @@
+import pytest
+from serial_benchmark import run_multi_scenario
+from serial_multi import MultiPortCapture
+
+
+@pytest.mark.parametrize('mode', MultiPortCapture.MODES)
+def test_every_port_is_captured_in_order(app, mode):
+    result = run_multi_scenario('test', mode, 3, 115200, 'counter', 0.3, seed=0)
+    assert result['ports'] == 3
+    assert result['sequence_errors'] == 0
+    assert result['min_port_bps'] > 0
+    assert result['bytes_received'] == result['bytes_sent']
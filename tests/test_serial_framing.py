@@ -0,0 +1,28 @@
+import struct
+import zlib
+import pytest
+from serial_framing import CHECKSUMS, append_checksum, cobs_decode, cobs_encode, create_framer
+
+
+@pytest.mark.parametrize('payload', [b'', b'a', b'\x00', b'a\x00b\x00', bytes(range(256)) * 3])
+def test_cobs_round_trip(payload):
+    assert cobs_decode(cobs_encode(payload)[:-1]) == payload
+
+
+@pytest.mark.parametrize('encoded', [b'\x03a', b'\x05abc', b'\x02a\x04bc'])
+def test_cobs_rejects_truncated_blocks(encoded):
+    with pytest.raises(ValueError):
+        cobs_decode(encoded)
+
+
+def test_truncated_cobs_frame_is_a_framing_error():
+    framer = create_framer('COBS')
+    assert framer.feed(b'\x03a\x00') == []
+    assert framer.framing_errors == 1
+
+
+def test_checksums_are_big_endian():
+    payload = b'123456789'
+    assert append_checksum(payload, 'crc16')[-2:] == b'\x29\xb1'  # CRC-16/CCITT-FALSE check value
+    assert append_checksum(payload, 'crc32')[-4:] == struct.pack('>I', zlib.crc32(payload)) == b'\xcb\xf4\x39\x26'
+    assert set(CHECKSUMS) == {'crc16', 'crc32'}
@@ -0,0 +1,85 @@
+import os
+import pty
+import time
+import tty
+import pytest
+import Serial_Reader
+from Serial_Reader import SerialMonitor
+from serial_capture import CaptureReader
+from serial_multi import MultiPortCapture
+
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize('mode', MultiPortCapture.MODES)
+def test_multi_port_capture_reaches_the_display(app, mode):
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    port_name = os.ttyname(slave)
+    window = SerialMonitor()
+    try:
+        window.multi_port_list.clear()
+        window.multi_port_list.addItem(port_name)
+        window.multi_port_list.item(0).setSelected(True)
+        window.multi_mode_combo.setCurrentText(mode)
+        window.start_multi_capture()
+        assert window.multi_capture is not None
+
+        os.write(master, b'hello')
+        assert wait_for(app, lambda: 'hello' in window.char_display.toPlainText())
+        assert f"[{port_name}]" in window.char_display.toPlainText()
+        assert all(reader.is_alive() for reader in window.multi_capture.readers)
+        assert not window.record_button.isEnabled()
+    finally:
+        window.stop_multi_capture()
+        window.close()
+        os.close(master)
+        os.close(slave)
+
+
+def test_recording_keeps_data_out_of_memory(app, tmp_path, monkeypatch):
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    capture_path = str(tmp_path / 'capture.scap')
+    monkeypatch.setattr(Serial_Reader.QFileDialog, 'getSaveFileName', lambda *args: (capture_path, ''))
+    monkeypatch.setattr(Serial_Reader.QFileDialog, 'getExistingDirectory', lambda *args: str(tmp_path))
+    monkeypatch.setattr(Serial_Reader, 'MAX_RECORDING_LINES', 50)
+    window = SerialMonitor()
+    try:
+        window.port_combo.addItem(os.ttyname(slave))
+        window.port_combo.setCurrentText(os.ttyname(slave))
+        window.start_monitoring()
+        window.toggle_recording()
+        assert not window.multi_start_button.isEnabled()
+
+        chunks = Serial_Reader.MAX_RECORDING_LINES + 30
+        received = []
+        window.serial_thread.data_received.connect(received.append)
+        for index in range(chunks):
+            os.write(master, b'x')
+            # One chunk per read, so every write becomes a display line
+            assert wait_for(app, lambda: len(received) > index)
+        window.stop_recording()
+
+        assert window.binary_data_list == []
+        assert window.char_display.document().blockCount() <= Serial_Reader.MAX_RECORDING_LINES
+        reader = CaptureReader(capture_path)
+        assert sum(len(data) for _, data in reader) == chunks
+        reader.close()
+
+        # Save Data exports the recorded chunks from the capture file
+        window.save_data()
+        assert (tmp_path / 'char_data.txt').read_text() == ''
+        assert (tmp_path / 'capture_char_data.txt').read_text() == '\n'.join(['x'] * chunks)
+    finally:
+        window.stop_recording()
+        window.stop_monitoring()
+        window.close()
+        os.close(master)
+        os.close(slave)
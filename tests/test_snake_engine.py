@@ -0,0 +1,31 @@
+import pytest
+from snake_core import MIN_COLS, MIN_ROWS
+from snake_engine import SnakeGame, parse_args
+from input_sources import KeyboardInput
+
+
+def test_small_window_starts_with_the_minimum_grid(app):
+    game = SnakeGame([KeyboardInput()], "Snake")
+    try:
+        game.resize(120, 150)
+        game.start_game()
+        assert (game.state.cols, game.state.rows) == (MIN_COLS, MIN_ROWS)
+    finally:
+        game.close()
+
+
+def test_board_argument(capsys):
+    assert parse_args(['main.py', '--board', '96x54']).board == (96, 54)
+    assert parse_args(['main.py', '--board', '96X54']).board == (96, 54)
+    for text in ('64', '64x', 'x54', '8x6x2', 'axb', '4x4'):
+        with pytest.raises(SystemExit):
+            parse_args(['main.py', '--board', text])
+    assert 'COLSxROWS' in capsys.readouterr().err
+
+
+def test_cell_size_argument(capsys):
+    assert parse_args(['main.py', '--cell-size', '12']).cell_size == 12
+    for text in ('0', '-5', '1.5', 'big'):
+        with pytest.raises(SystemExit):
+            parse_args(['main.py', '--cell-size', text])
+    assert 'positive' in capsys.readouterr().err
@@ -0,0 +1,52 @@
+import threading
+import time
+import pytest
+from worker_control import WorkerControl, measure
+
+MAX_STOP_SECONDS = 0.05  # A 10 s sleep has to end this soon after stop()
+
+
+def run_worker(control, wait):
+    finished = []
+
+    def worker():
+        result = wait(control)
+        finished.append((time.perf_counter(), result))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)  # Let it get into the wait
+    assert not finished
+    return thread, finished
+
+
+def stop_latency(control, thread, finished):
+    stopped = time.perf_counter()
+    control.stop()
+    thread.join(5)
+    assert finished, "worker did not wake up"
+    end, result = finished[0]
+    assert result is False
+    return end - stopped
+
+
+@pytest.mark.parametrize('paused', [False, True])
+def test_stop_wakes_a_sleeping_worker(paused):
+    control = WorkerControl()
+    if paused:
+        control.pause()
+    thread, finished = run_worker(control, lambda control: control.sleep(10))
+    assert stop_latency(control, thread, finished) < MAX_STOP_SECONDS
+
+
+def test_stop_wakes_a_worker_paused_at_a_checkpoint():
+    control = WorkerControl()
+    control.pause()
+    thread, finished = run_worker(control, lambda control: control.checkpoint())
+    assert stop_latency(control, thread, finished) < MAX_STOP_SECONDS
+
+
+def test_paused_worker_does_not_step_and_resumes():
+    stop_latencies, resume_latencies, _ = measure(period=0.02, repeats=3)
+    assert max(stop_latencies) < 1000 * MAX_STOP_SECONDS
+    assert max(resume_latencies) < 1000 * MAX_STOP_SECONDS
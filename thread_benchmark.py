@@ -0,0 +1,285 @@
+import argparse
+import json
+import resource
+import sys
+import time
+from array import array
+
+from PyQt5.QtWidgets import QApplication, QLabel
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from perf_stats import use_offscreen_platform, percentile, run_event_loop
+from worker_pool import Task, WorkerPool
+
+use_offscreen_platform()
+
+SAMPLE_MASK = 1023  # Timestamp every 1024th count for latency measurements
+CHECK_MASK = 255  # Batched workers look at the clock every 256 counts
+
+
+class CounterSignals(QObject):
+    update_count = pyqtSignal(int)
+
+
+def count_direct(task, signals, sent_times, emitted):
+    # thread_example.py without the sleep: one cross-thread signal per increment
+    count = 0
+    while not task.cancelled:
+        count += 1
+        if count & SAMPLE_MASK == 0:
+            sent_times[count] = time.perf_counter()
+        emitted[0] = count
+        signals.update_count.emit(count)
+    return count
+
+
+def count_batched(task, signals, sent_times, emitted, interval):
+    # Emit the latest count at most once per interval
+    count = 0
+    last_emit = time.perf_counter()
+    while not task.cancelled:
+        count += 1
+        if count & CHECK_MASK == 0:
+            now = time.perf_counter()
+            if now - last_emit >= interval:
+                sent_times[count] = now
+                emitted[0] += 1
+                signals.update_count.emit(count)
+                last_emit = now
+    return count
+
+
+def count_shared(task, shared, written):
+    # No signals at all, the GUI polls the shared counter on a timer
+    count = 0
+    while not task.cancelled:
+        count += 1
+        shared[0] = count
+        if count & CHECK_MASK == 0:
+            written[0] = time.perf_counter()
+    return count
+
+
+class GuiProbe:
+    """GUI-thread side: updates the label like updateLabel1 and keeps the numbers."""
+
+    def __init__(self, label, sent_times):
+        self.label = label
+        self.sent_times = sent_times
+        self.received = 0
+        self.latencies = []
+        self.timer_lags = []
+        self.max_backlog = 0
+        self.last_beat = None
+
+    def on_count(self, count):
+        self.received += 1
+        self.label.setText(f'Thread 1: {count}')
+        sent = self.sent_times.pop(count, None)
+        if sent is not None:
+            self.latencies.append(1000 * (time.perf_counter() - sent))
+
+    def heartbeat(self, interval, emitted):
+        # A 10 ms GUI timer firing late means the event queue is backed up
+        now = time.perf_counter()
+        if self.last_beat is not None:
+            self.timer_lags.append(1000 * (now - self.last_beat - interval))
+        self.last_beat = now
+        self.max_backlog = max(self.max_backlog, emitted[0] - self.received)
+
+
+def run_mode(mode, duration, batch_interval, poll_interval):
+    pool = WorkerPool(max_workers=1)
+    label = QLabel('Thread 1: 0')
+    signals = CounterSignals()
+    sent_times = {}
+    probe = GuiProbe(label, sent_times)
+    shared = array('q', [0])
+    written = array('d', [0.0])
+    emitted = array('q', [0])  # Signals queued by the worker so far
+    staleness = []
+
+    if mode == 'direct':
+        task = Task(count_direct, signals, sent_times, emitted)
+    elif mode == 'batched':
+        task = Task(count_batched, signals, sent_times, emitted, batch_interval)
+    elif mode == 'polling':
+        task = Task(count_shared, shared, written)
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+    signals.update_count.connect(probe.on_count)
+
+    result = {}
+    task.signals.result.connect(lambda count: result.setdefault('count', count))
+
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(lambda: probe.heartbeat(0.010, emitted))
+    heartbeat.start(10)
+
+    poll_timer = QTimer()
+
+    def poll():
+        count = shared[0]
+        probe.received += 1
+        label.setText(f'Thread 1: {count}')
+        if written[0]:
+            staleness.append(1000 * (time.perf_counter() - written[0]))
+
+    if mode == 'polling':
+        poll_timer.timeout.connect(poll)
+        poll_timer.start(max(1, int(poll_interval * 1000)))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    pool.submit(task)
+    run_event_loop(duration)
+    task.cancel()
+    stopped = time.perf_counter()
+
+    # Whatever is still queued gets delivered before the UI is current again
+    while 'count' not in result and time.perf_counter() - stopped < 10:
+        QApplication.processEvents()
+    count = result.get('count', 0)
+    while mode != 'polling' and probe.received < emitted[0] and time.perf_counter() - stopped < 30:
+        QApplication.processEvents()
+    drained = time.perf_counter()
+    cpu = time.process_time() - cpu_before
+    heartbeat.stop()
+    poll_timer.stop()
+    pool.shutdown()
+
+    wall = stopped - started
+    latencies = staleness if mode == 'polling' else probe.latencies
+    return {
+        'mode': mode,
+        'seconds': round(wall, 3),
+        'increments_per_s': round(count / wall),
+        'ui_updates_per_s': round(probe.received / (drained - started)),
+        'max_backlog': probe.max_backlog,
+        'drain_ms': round(1000 * (drained - stopped), 1),
+        'latency_ms_p50': percentile(latencies, 0.50),
+        'latency_ms_p99': percentile(latencies, 0.99),
+        'gui_timer_lag_ms_p50': percentile(probe.timer_lags, 0.50),
+        'gui_timer_lag_ms_p99': percentile(probe.timer_lags, 0.99),
+        'cpu_percent': round(100 * cpu / (drained - started), 1),
+        'rss_growth_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+    }
+
+
+def count_to(task, limit, marks):
+    marks.append(('start', time.perf_counter()))
+    count = 0
+    while count < limit and not task.cancelled:
+        count += 1
+    marks.append(('end', time.perf_counter()))
+    return count
+
+
+class CountThread(QThread):
+    """The old way: a fresh QThread per counter, started from the finished signal."""
+    finished_count = pyqtSignal(int)
+
+    def __init__(self, limit, marks):
+        super().__init__()
+        self.limit = limit
+        self.marks = marks
+
+    def run(self):
+        self.marks.append(('start', time.perf_counter()))
+        count = 0
+        while count < self.limit:
+            count += 1
+        self.marks.append(('end', time.perf_counter()))
+        self.finished_count.emit(count)
+
+
+def handoff_gaps(marks):
+    return [1000 * (start - end) for (_, end), (_, start) in zip(marks[1::2], marks[2::2])]
+
+
+def run_handoffs(cycles, limit=1000):
+    # Pool: the finishing worker starts the next task itself
+    pool = WorkerPool(max_workers=2)
+    pool_marks = []
+    remaining = [cycles]
+
+    def next_task(count):
+        remaining[0] -= 1
+        if remaining[0] <= 0:
+            return None
+        return Task(count_to, limit, pool_marks).then(next_task)
+
+    pool.submit(Task(count_to, limit, pool_marks).then(next_task))
+    deadline = time.perf_counter() + 30
+    while pool.is_busy() and time.perf_counter() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+    pool.shutdown()
+
+    # New QThread per handoff, through the GUI thread like thread_example.py used to
+    thread_marks = []
+    threads = []
+
+    def start_next(count):
+        if len(threads) < cycles:
+            thread = CountThread(limit, thread_marks)
+            thread.finished_count.connect(start_next)
+            threads.append(thread)
+            thread.start()
+
+    start_next(0)
+    while (len(threads) < cycles or threads[-1].isRunning()) and time.perf_counter() < deadline:
+        QApplication.processEvents()
+    for thread in threads:
+        thread.wait()
+
+    results = []
+    for name, marks in (('pool', pool_marks), ('new_qthread', thread_marks)):
+        gaps = handoff_gaps(marks)
+        results.append({
+            'handoff': name,
+            'cycles': len(gaps) + 1,
+            'gap_ms_p50': percentile(gaps, 0.50),
+            'gap_ms_p99': percentile(gaps, 0.99),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-thread signal and handoff benchmark for thread_example.py")
+    parser.add_argument('--mode', action='append', choices=('direct', 'batched', 'polling'),
+                        help="Update strategy to run (default: all)")
+    parser.add_argument('--duration', type=float, default=2.0, help="Seconds per mode")
+    parser.add_argument('--batch-ms', type=float, default=5.0, help="Batched mode: minimum ms between signals")
+    parser.add_argument('--poll-ms', type=float, default=16.0, help="Polling mode: GUI timer period in ms")
+    parser.add_argument('--handoffs', type=int, default=200, help="Counter handoffs to time (0 to skip)")
+    parser.add_argument('--output', help="Write results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    results = []
+    for mode in args.mode or ('direct', 'batched', 'polling'):
+        result = run_mode(mode, args.duration, args.batch_ms / 1000, args.poll_ms / 1000)
+        results.append(result)
+        latency = (f"{result['latency_ms_p50']:.2f}/{result['latency_ms_p99']:.2f} ms"
+                   if result['latency_ms_p50'] is not None else "-")
+        lag = (f"{result['gui_timer_lag_ms_p50']:.1f}/{result['gui_timer_lag_ms_p99']:.1f} ms"
+               if result['gui_timer_lag_ms_p50'] is not None else "-")
+        print(f"{mode:8} {result['increments_per_s']:>11,} counts/s  {result['ui_updates_per_s']:>9,} UI updates/s  "
+              f"backlog {result['max_backlog']:>9,}  drain {result['drain_ms']:>8} ms  latency p50/p99 {latency:>18}  "
+              f"GUI timer lag {lag:>14}  cpu {result['cpu_percent']}%  rss +{result['rss_growth_kb']} kB")
+
+    if args.handoffs:
+        for result in run_handoffs(args.handoffs):
+            results.append(result)
+            print(f"handoff {result['handoff']:12} {result['cycles']} cycles  "
+                  f"gap p50 {result['gap_ms_p50']:.3f} ms  p99 {result['gap_ms_p99']:.3f} ms")
+    app.processEvents()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
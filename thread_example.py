@@ -1,56 +1,26 @@
 import sys
-import time
-from PyQt5.QtCore import QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton
+from worker_pool import Task, WorkerPool
+from process_counter import ProcessCounters
 
-class CounterThread1(QThread):
-    update_count = pyqtSignal(int)
-    finished_count = pyqtSignal(int)
-
-    def __init__(self, count=0):
-        super().__init__()
-        self.count = count
-        self.running = True
-
-    def run(self):
-        try:
-            while self.running:
-                self.count += 1
-                self.update_count.emit(self.count)
-                time.sleep(0.1)
-                # self.wait()
-        finally:
-            self.finished_count.emit(self.count)
-
-    def stop(self):
-        self.running = False
-
-class CounterThread2(QThread):
-    update_count = pyqtSignal(int)
-    finished_count = pyqtSignal(int)
-
-    def __init__(self, start_count):
-        super().__init__()
-        self.count = start_count
-        self.running = True
-
-    def run(self):
-        try:
-            while self.running:
-                self.count += 1
-                self.update_count.emit(self.count)
-                time.sleep(0.1)
-                # self.wait()
-        finally:
-            self.finished_count.emit(self.count)
-
-    def stop(self):
-        self.running = False
+def count_up(task, count=0):
+    # Runs on a pool thread until cancelled, the final count is handed to the next counter
+    while task.control.sleep(0.1):
+        count += 1
+        task.report(count)
+    return count
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, use_processes=False):
         super().__init__()
 
+        # Two long-lived workers take turns counting, no thread is created per handoff
+        self.pool = WorkerPool(max_workers=2)
+        # Or two long-lived processes, for counters doing CPU-bound work past the GIL
+        self.processes = None
+        if use_processes:
+            self.processes = ProcessCounters()
+            self.processes.update_count.connect(self.updateLabel)
         self.initUI()
 
     def initUI(self):
@@ -70,23 +40,47 @@ class MainWindow(QWidget):
         self.stop_button.clicked.connect(self.stopThreads)
         self.layout.addWidget(self.stop_button)
 
-        self.setLayout(self.layout)
+        self.pause_button = QPushButton('Pause', self)
+        self.pause_button.clicked.connect(self.togglePause)
+        self.layout.addWidget(self.pause_button)
 
-        self.counter1 = CounterThread1()
-        self.counter1.update_count.connect(self.updateLabel1)
-        self.counter1.finished_count.connect(self.startCounter2)
+        self.setLayout(self.layout)
 
-        self.counter2 = None
+    def counterTask(self, counter, count):
+        # Counter 1 hands its final count to counter 2 and back again
+        task = Task(count_up, count)
+        task.signals.progress.connect(self.updateLabel1 if counter == 1 else self.updateLabel2)
+        task.then(lambda result: self.counterTask(3 - counter, result))
+        return task
 
     def startThreads(self):
-        if not self.counter1.isRunning():
-            self.counter1.start()
+        if self.processes is not None:
+            self.processes.start()
+        elif not self.pool.is_busy():
+            self.pool.submit(self.counterTask(1, 0))
 
     def stopThreads(self):
-        if self.counter1.isRunning():
-            self.counter1.stop()
-        if self.counter2 is not None and self.counter2.isRunning():
-            self.counter2.stop()
+        # Stops the running counter, which hands off to the other one
+        if self.processes is not None:
+            self.processes.handoff()
+        else:
+            self.pool.cancel_all()
+
+    def togglePause(self):
+        # Paused counters block on a condition, they use no CPU until resumed
+        backend = self.processes or self.pool
+        if backend.paused:
+            backend.resume()
+            self.pause_button.setText('Pause')
+        else:
+            backend.pause()
+            self.pause_button.setText('Resume')
+
+    def updateLabel(self, counter, count):
+        if counter == 1:
+            self.updateLabel1(count)
+        else:
+            self.updateLabel2(count)
 
     def updateLabel1(self, count):
         self.label1.setText(f'Thread 1: {count}')
@@ -94,22 +88,20 @@ class MainWindow(QWidget):
     def updateLabel2(self, count):
         self.label2.setText(f'Thread 2: {count}')
 
-    def startCounter2(self, count):
-        if self.counter2 is None or not self.counter2.isRunning():
-            self.counter2 = CounterThread2(count)
-            self.counter2.update_count.connect(self.updateLabel2)
-            self.counter2.finished_count.connect(self.restartCounter1)
-            self.counter2.start()
-
-    def restartCounter1(self, count):
-        if not self.counter1.isRunning():
-            self.counter1 = CounterThread1(count)
-            self.counter1.update_count.connect(self.updateLabel1)
-            self.counter1.finished_count.connect(self.startCounter2)
-            self.counter1.start()
+    def closeEvent(self, event):
+        self.pool.shutdown()
+        if self.processes is not None:
+            self.processes.shutdown()
+        event.accept()
 
 if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        # Headless signal/handoff measurements, see thread_benchmark.py for the options
+        import thread_benchmark
+        sys.argv.remove('--benchmark')
+        thread_benchmark.main()
+        sys.exit()
     app = QApplication(sys.argv)
-    mainWindow = MainWindow()
+    mainWindow = MainWindow(use_processes='--processes' in sys.argv)
     mainWindow.show()
     sys.exit(app.exec_())
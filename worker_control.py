@@ -0,0 +1,131 @@
+import argparse
+import sys
+import threading
+import time
+
+
+class WorkerControl:
+    """Pause, resume and stop requests for a worker loop.
+
+    Everything waits on one threading.Condition, so a paused worker sleeps in
+    the kernel until it is resumed or stopped, and a stop wakes any wait at
+    once instead of after the next poll. A worker loop looks like:
+
+        while control.sleep(0.1):
+            do_one_step()
+
+    sleep() and checkpoint() block while paused and return False once a stop
+    has been requested.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.paused = False
+        self.stopped = False
+
+    @property
+    def stop_requested(self):
+        return self.stopped
+
+    def pause(self):
+        with self.condition:
+            self.paused = True
+            self.condition.notify_all()
+
+    def resume(self):
+        with self.condition:
+            self.paused = False
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def reset(self):
+        # Clear a previous stop before the worker is started again
+        with self.condition:
+            self.paused = False
+            self.stopped = False
+
+    def checkpoint(self):
+        with self.condition:
+            while self.paused and not self.stopped:
+                self.condition.wait()
+            return not self.stopped
+
+    def sleep(self, seconds):
+        # Like time.sleep, but ends early on stop and holds while paused
+        deadline = time.monotonic() + seconds
+        with self.condition:
+            while not self.stopped:
+                if self.paused:
+                    self.condition.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            return not self.stopped
+
+
+def measure(period, repeats):
+    """Stop and resume latencies in ms of a worker sleeping `period` s per step, plus its CPU time while paused."""
+    stop_latencies = []
+    resume_latencies = []
+    paused_cpu = []
+    for _ in range(repeats):
+        control = WorkerControl()
+        steps = []
+
+        def worker():
+            thread_cpu = time.thread_time()
+            while control.sleep(period):
+                steps.append(time.perf_counter())
+            paused_cpu.append(time.thread_time() - thread_cpu)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(period * 2.5)
+
+        control.pause()
+        count = len(steps)
+        time.sleep(0.2)
+        if len(steps) > count + 1:
+            raise AssertionError("Worker kept running while paused")
+        resume_time = time.perf_counter()
+        control.resume()
+        # The sleep that was cut short by the pause has run out, so the worker steps right away
+        while len(steps) == count and time.perf_counter() - resume_time < 1:
+            time.sleep(0.0005)
+        resume_latencies.append(1000 * (steps[-1] - resume_time) if len(steps) > count else float('inf'))
+
+        # Stop lands in the middle of a sleep
+        time.sleep(period / 2)
+        stop_time = time.perf_counter()
+        control.stop()
+        thread.join()
+        stop_latencies.append(1000 * (time.perf_counter() - stop_time))
+    return stop_latencies, resume_latencies, paused_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that WorkerControl stops and resumes workers promptly")
+    parser.add_argument('--period', type=float, default=0.1, help="Worker sleep per step in seconds")
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--max-stop-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    stop_latencies, resume_latencies, paused_cpu = measure(args.period, args.repeats)
+    worst_stop = max(stop_latencies)
+    print(f"Stop latency max {worst_stop:.2f} ms (a {1000 * args.period:.0f} ms sleep poll would take up to "
+          f"{1000 * args.period:.0f} ms)")
+    print(f"Resume to next step max {max(resume_latencies):.2f} ms")
+    print(f"Worker CPU over a run with 200 ms paused max {1000 * max(paused_cpu):.2f} ms")
+    if worst_stop > args.max_stop_ms:
+        print(f"FAIL: stop latency above {args.max_stop_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
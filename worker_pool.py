@@ -0,0 +1,132 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from worker_control import WorkerControl
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Task(QRunnable):
+    """A unit of work for WorkerPool.
+
+    fn is called as fn(task, *args, **kwargs) on a pool thread. It reports
+    progress with task.report(value), waits with task.control.sleep() so it
+    can be paused, and should return soon after task.cancelled becomes true.
+    Its return value is emitted as result and, if a follow-up was set with
+    then(), handed to the next task.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.control = WorkerControl()
+        self.next_factory = None
+        self.pool = None
+
+    @property
+    def cancelled(self):
+        return self.control.stop_requested
+
+    def cancel(self):
+        self.control.stop()
+
+    def report(self, value):
+        self.signals.progress.emit(value)
+
+    def then(self, factory):
+        # factory(result) returns the next Task (or None to end the chain)
+        self.next_factory = factory
+        return self
+
+    def run(self):
+        ok = False
+        result = None
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+            ok = True
+            self.signals.result.emit(result)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        finally:
+            self.pool.task_done(self, ok, result)
+            self.signals.finished.emit()
+
+
+class WorkerPool:
+    """Bounded pool of long-lived worker threads fed from QThreadPool's queue.
+
+    Threads never expire, so submitting a task or handing off from one task
+    to the next reuses an existing thread instead of starting a new one.
+    Handoffs run on the worker that finished, without a round trip through
+    the GUI thread.
+    """
+
+    def __init__(self, max_workers=2):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self.pool.setExpiryTimeout(-1)
+        self.lock = threading.Lock()
+        self.active = set()
+        self.closed = False
+        self.paused = False
+        self.submitted = 0
+
+    def submit(self, task):
+        with self.lock:
+            return self.start_task(task)
+
+    def start_task(self, task):
+        # Caller holds the lock
+        if self.closed:
+            return None
+        task.pool = self
+        if self.paused:
+            # A handoff made while paused starts out paused too
+            task.control.pause()
+        self.active.add(task)
+        self.submitted += 1
+        self.pool.start(task)
+        return task
+
+    def task_done(self, task, ok, result):
+        with self.lock:
+            self.active.discard(task)
+            if ok and task.next_factory is not None and not self.closed:
+                next_task = task.next_factory(result)
+                if next_task is not None:
+                    self.start_task(next_task)
+
+    def is_busy(self):
+        with self.lock:
+            return bool(self.active)
+
+    def pause(self):
+        with self.lock:
+            self.paused = True
+            for task in self.active:
+                task.control.pause()
+
+    def resume(self):
+        with self.lock:
+            self.paused = False
+            for task in self.active:
+                task.control.resume()
+
+    def cancel_all(self):
+        with self.lock:
+            for task in self.active:
+                task.cancel()
+
+    def shutdown(self, timeout_ms=-1):
+        with self.lock:
+            self.closed = True
+            for task in self.active:
+                task.cancel()
+        return self.pool.waitForDone(timeout_ms)